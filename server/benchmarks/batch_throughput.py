@@ -0,0 +1,63 @@
+"""Throughput benchmark for /analyze/batch against a stub model.
+
+Posts one batch of generated PDF resumes per BATCH_CONCURRENCY setting and
+reads the NDJSON stream, reporting resumes/second and time to first result.
+Every run uses fresh resumes so the text and result caches never hit.
+
+    python benchmarks/batch_throughput.py --resumes 64 --latency 0.2 --concurrency 1 8 32
+"""
+import argparse
+import asyncio
+import json
+import time
+
+import httpx
+
+from common import SAMPLE_JD, SAMPLE_RESUME_LINES, load_app, make_pdf, serve
+
+def make_batch(run, count):
+    return [
+        ("resumes", (f"resume-{run}-{i}.pdf", make_pdf([[f"Candidate {run}-{i}"] + SAMPLE_RESUME_LINES]), "application/pdf"))
+        for i in range(count)
+    ]
+
+async def run_batch(client, files):
+    start = time.perf_counter()
+    first = None
+    ok = 0
+    async with client.stream("POST", "/analyze/batch", files=files, data={"jd_text": SAMPLE_JD}) as response:
+        response.raise_for_status()
+        async for line in response.aiter_lines():
+            if not line:
+                continue
+            item = json.loads(line)
+            if "summary" in item:
+                continue
+            if first is None:
+                first = time.perf_counter() - start
+            ok += item["status"] == "ok"
+    return ok, first, time.perf_counter() - start
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--resumes", type=int, default=64)
+    parser.add_argument("--latency", type=float, default=0.2, help="stub model latency in seconds")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32])
+    args = parser.parse_args()
+
+    server = load_app(args.latency)
+    rows = []
+    async with serve(server.app) as base_url, httpx.AsyncClient(base_url=base_url, timeout=None) as client:
+        await run_batch(client, make_batch("warmup", 1))
+        for run, concurrency in enumerate(args.concurrency):
+            server.BATCH_CONCURRENCY = concurrency
+            ok, first, elapsed = await run_batch(client, make_batch(run, args.resumes))
+            rows.append((concurrency, ok, first, elapsed))
+    server.execution.shutdown()
+
+    print(f"{'concurrency':>12}{'ok':>6}{'first (s)':>11}{'total (s)':>11}{'resumes/s':>11}")
+    for concurrency, ok, first, elapsed in rows:
+        print(f"{concurrency:>12}{ok:>6}{first:>11.3f}{elapsed:>11.3f}{ok / elapsed:>11.1f}")
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,167 @@
+"""Shared helpers for the server benchmarks.
+
+Benchmarks run fully offline: the server runs on the fake model backend
+(MODEL_BACKEND=fake) with a fixed latency, so the numbers measure the server
+rather than the API.
+"""
+import asyncio
+import contextlib
+import math
+import os
+import socket
+import sys
+import zipfile
+from io import BytesIO
+from xml.sax.saxutils import escape
+
+SERVER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if SERVER_DIR not in sys.path:
+    sys.path.insert(0, SERVER_DIR)
+
+def load_app(latency, **fake_options):
+    """Import the server on the fake model backend.
+
+    `latency` and `fake_options` configure its model_client.FakeClient.
+    """
+    os.environ["MODEL_BACKEND"] = "fake"
+    # Keep per-request server logging out of the report
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+    import main
+    from model_client import FakeClient
+    main.model_client = FakeClient(latency=latency, **fake_options)
+    return main
+
+@contextlib.asynccontextmanager
+async def serve(app):
+    """Run `app` under uvicorn on a free local port and yield its base URL.
+
+    Needed where the benchmark depends on real streaming: httpx's
+    ASGITransport buffers the whole response body.
+    """
+    import uvicorn
+    sock = socket.socket()
+    sock.bind(("127.0.0.1", 0))
+    server = uvicorn.Server(uvicorn.Config(app, log_level="warning", lifespan="off"))
+    task = asyncio.create_task(server.serve(sockets=[sock]))
+    try:
+        while not server.started:
+            await asyncio.sleep(0.01)
+        yield f"http://127.0.0.1:{sock.getsockname()[1]}"
+    finally:
+        server.should_exit = True
+        await task
+        sock.close()
+
+def _pdf_escape(line):
+    return line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+def make_pdf(pages):
+    """Build a minimal text PDF; `pages` is a list of lists of lines"""
+    objects = ["<< /Type /Catalog /Pages 2 0 R >>", None,
+               "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    page_ids = []
+    for lines in pages:
+        ops = ["BT", "/F1 10 Tf", "12 TL", "50 760 Td"]
+        for line in lines:
+            ops.append(f"({_pdf_escape(line)}) Tj T*")
+        ops.append("ET")
+        stream = "\n".join(ops)
+        objects.append(f"<< /Length {len(stream.encode('latin-1'))} >>\nstream\n{stream}\nendstream")
+        content_id = len(objects)
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {content_id} 0 R >>"
+        )
+        page_ids.append(len(objects))
+    kids = " ".join(f"{i} 0 R" for i in page_ids)
+    objects[1] = f"<< /Type /Pages /Kids [{kids}] /Count {len(page_ids)} >>"
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n{body}\nendobj\n".encode("latin-1")
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode("latin-1")
+    for offset in offsets:
+        out += f"{offset:010d} 00000 n \n".encode("latin-1")
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode("latin-1")
+    return bytes(out)
+
+DOCX_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/word/document.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+    '</Types>'
+)
+DOCX_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" Target="word/document.xml" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument"/>'
+    '</Relationships>'
+)
+
+def make_docx(pages):
+    """Build a minimal DOCX (one paragraph per line, page breaks between
+    pages); `pages` is a list of lists of lines"""
+    paragraphs = []
+    for number, lines in enumerate(pages):
+        if number:
+            paragraphs.append('<w:p><w:r><w:br w:type="page"/></w:r></w:p>')
+        paragraphs.extend(f'<w:p><w:r><w:t xml:space="preserve">{escape(line)}</w:t></w:r></w:p>' for line in lines)
+    document = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+        f'<w:body>{"".join(paragraphs)}</w:body></w:document>'
+    )
+    out = BytesIO()
+    with zipfile.ZipFile(out, "w", zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr("[Content_Types].xml", DOCX_CONTENT_TYPES)
+        archive.writestr("_rels/.rels", DOCX_RELS)
+        archive.writestr("word/document.xml", document)
+    return out.getvalue()
+
+OLE2_SIGNATURE = bytes.fromhex("d0cf11e0a1b11ae1")
+
+def make_doc(pages):
+    """Build a stand-in for a Word 97 .doc: the OLE2 signature, a zeroed
+    header and the text as 8-bit characters, padded to 512-byte sectors.
+
+    Not a valid compound file; it only has to look like one to
+    extract_text_from_doc, which reads the bytes as text.
+    """
+    text = "\r".join(line for lines in pages for line in lines).encode("cp1252", errors="replace")
+    body = OLE2_SIGNATURE + bytes(504) + text
+    return body + bytes(-len(body) % 512)
+
+SAMPLE_RESUME_LINES = [
+    "Jane Doe - Software Engineer",
+    "jane.doe@example.com | github.com/janedoe",
+    "EXPERIENCE",
+    "Backend Engineer, Acme Corp (2021 - present)",
+    "- Built Python and FastAPI services handling 2M requests per day",
+    "- Cut p99 latency by 40% by moving PDF parsing to a worker pool",
+    "PROJECTS",
+    "Resume Parser - extracts structured data from PDF and DOCX files",
+    "SKILLS",
+    "Python, FastAPI, PostgreSQL, Docker, AWS, Redis",
+    "EDUCATION",
+    "B.Tech in Computer Science, 2020",
+]
+
+SAMPLE_JD = (
+    "We are hiring a backend engineer with strong Python and FastAPI experience. "
+    "Required: PostgreSQL, Docker, Kubernetes and AWS. Familiarity with Redis is a plus."
+)
+
+def percentile(samples, pct):
+    """Nearest-rank percentile of a list of numbers"""
+    ordered = sorted(samples)
+    if not ordered:
+        return 0.0
+    rank = max(0, min(len(ordered) - 1, math.ceil(pct / 100.0 * len(ordered)) - 1))
+    return ordered[rank]
@@ -0,0 +1,42 @@
+"""Size report for prompt compaction (compaction.py).
+
+For every resume/JD fixture pair in tests/fixtures/compaction this compacts
+the inputs as make_prompt() does and reports the estimated tokens before
+and after and which resume sections had to be cut to fit. The checks that
+compaction doesn't change the local pre-score are in
+tests/test_compaction.py.
+
+    python benchmarks/compaction_report.py --budget 2000
+"""
+import argparse
+import glob
+import os
+
+from common import SERVER_DIR
+
+import compaction
+
+FIXTURES_DIR = os.path.join(SERVER_DIR, "tests", "fixtures", "compaction")
+
+def read(path):
+    with open(path, encoding="utf-8") as f:
+        return f.read()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--budget", type=int, default=None, help="token budget (default PROMPT_TOKEN_BUDGET)")
+    args = parser.parse_args()
+
+    resumes = sorted(glob.glob(os.path.join(FIXTURES_DIR, "resume_*.txt")))
+    jds = sorted(glob.glob(os.path.join(FIXTURES_DIR, "jd_*.txt")))
+    name = lambda path: os.path.basename(path)[:-4]
+    print(f"{'resume':<18}{'jd':<14}{'tokens':>14}{'saved':>8}  cut")
+    for resume_path in resumes:
+        for jd_path in jds:
+            _, _, stats = compaction.compact_inputs(read(resume_path), read(jd_path), args.budget)
+            before, after = stats["input_tokens_before"], stats["input_tokens_after"]
+            print(f"{name(resume_path):<18}{name(jd_path):<14}{f'{before}->{after}':>14}"
+                  f"{1 - after / before:>8.0%}  {','.join(stats['truncated_sections']) or '-'}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Generated resume corpus for the extraction and load benchmarks.
+
+Seeded synthetic resumes rendered as PDF, DOCX and DOC at a few lengths, so
+every run (and every machine) benchmarks the same documents. Other
+benchmarks build the corpus in memory; this script writes it to disk, e.g.
+to inspect the files or to run the server against them by hand.
+
+    python benchmarks/corpus.py benchmarks/fixtures/corpus
+"""
+import argparse
+import os
+import random
+
+from common import make_doc, make_docx, make_pdf
+
+import scoring
+
+FORMATS = ("pdf", "docx", "doc")
+# Name -> number of pages
+SIZES = {"short": 1, "typical": 2, "long": 10}
+LINES_PER_PAGE = 45
+
+BUILDERS = {"pdf": make_pdf, "docx": make_docx, "doc": make_doc}
+
+ROLES = ["Software Engineer", "Backend Engineer", "Data Engineer", "Frontend Developer", "ML Engineer"]
+ACHIEVEMENTS = [
+    "Built {skill} services handling {n}M requests per day",
+    "Cut p99 latency by {n}0% by profiling and caching hot paths in {skill}",
+    "Migrated the reporting pipeline to {skill}, saving {n} engineer-days per month",
+    "Led a team of {n} engineers delivering the {skill} platform rewrite",
+    "Automated deployments with {skill}, taking releases from weekly to daily",
+    "Designed the {skill} data model behind a feature used by {n}00k customers",
+]
+
+def resume_pages(seed, pages):
+    """Lines of a synthetic resume, split into `pages` pages"""
+    rng = random.Random(seed)
+    skills = rng.sample(scoring.KNOWN_SKILLS, 12)
+    lines = [
+        f"Candidate {seed} - {rng.choice(ROLES)}",
+        f"candidate{seed}@example.com | +1 555 {rng.randint(1000000, 9999999)}",
+        "SUMMARY",
+        f"Engineer with {rng.randint(2, 15)} years of experience in {', '.join(skills[:3])}.",
+        "SKILLS",
+        ", ".join(skills),
+        "EXPERIENCE",
+    ]
+    target = pages * LINES_PER_PAGE - 3
+    while len(lines) < target:
+        start = rng.randint(2008, 2022)
+        lines.append(f"{rng.choice(ROLES)}, Company {rng.randint(1, 900)} ({start} - {start + rng.randint(1, 3)})")
+        for _ in range(rng.randint(3, 6)):
+            template = rng.choice(ACHIEVEMENTS)
+            lines.append("- " + template.format(skill=rng.choice(skills), n=rng.randint(2, 9)))
+    lines = lines[:target] + ["EDUCATION", "B.Sc. Computer Science", f"Graduated {rng.randint(2005, 2020)}"]
+    return [lines[i:i + LINES_PER_PAGE] for i in range(0, len(lines), LINES_PER_PAGE)]
+
+def make_document(file_type, seed, pages):
+    """One synthetic resume as the bytes of a `file_type` file"""
+    return BUILDERS[file_type](resume_pages(seed, pages))
+
+def generate(formats=FORMATS, sizes=None, seed=0):
+    """The corpus as a list of (filename, file_type, content)"""
+    sizes = sizes or SIZES
+    return [
+        (f"resume_{size}.{file_type}", file_type, make_document(file_type, seed, pages))
+        for file_type in formats
+        for size, pages in sizes.items()
+    ]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("directory")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    os.makedirs(args.directory, exist_ok=True)
+    for filename, _, content in generate(seed=args.seed):
+        with open(os.path.join(args.directory, filename), "wb") as f:
+            f.write(content)
+        print(f"{filename:<22}{len(content) // 1024:>6} KB")
+
+if __name__ == "__main__":
+    main()
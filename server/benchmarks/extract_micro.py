@@ -0,0 +1,56 @@
+"""Micro-benchmarks for the extract_text_from_* functions.
+
+Times each extractor directly (no server, no process pool) on every document
+of the generated corpus (corpus.py), or on the files in --corpus DIR, and
+reports the median and p95 time per call, throughput and characters
+extracted.
+
+    python benchmarks/extract_micro.py --repeat 20
+    python benchmarks/extract_micro.py --corpus ~/resumes
+"""
+import argparse
+import os
+import time
+
+from common import percentile
+import corpus
+
+import extraction
+
+EXTRACTORS = {
+    "pdf": extraction.extract_text_from_pdf,
+    "docx": extraction.extract_text_from_docx,
+    "doc": extraction.extract_text_from_doc,
+}
+
+def load_directory(directory):
+    documents = []
+    for filename in sorted(os.listdir(directory)):
+        file_type = extraction.get_file_extension(filename)
+        if file_type in EXTRACTORS:
+            with open(os.path.join(directory, filename), "rb") as f:
+                documents.append((filename, file_type, f.read()))
+    return documents
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=20, help="timed calls per document")
+    parser.add_argument("--corpus", help="directory of .pdf/.docx/.doc files (default: generated corpus)")
+    args = parser.parse_args()
+
+    documents = load_directory(args.corpus) if args.corpus else corpus.generate()
+    print(f"{'document':<24}{'KB':>7}{'median (ms)':>13}{'p95 (ms)':>10}{'MB/s':>8}{'chars':>8}")
+    for filename, file_type, content in documents:
+        extract = EXTRACTORS[file_type]
+        text = extract(content)  # warm up (imports, font caches)
+        timings = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            extract(content)
+            timings.append(time.perf_counter() - start)
+        median = percentile(timings, 50)
+        print(f"{filename:<24}{len(content) / 1024:>7.0f}{median * 1000:>13.2f}{percentile(timings, 95) * 1000:>10.2f}"
+              f"{len(content) / (1024 * 1024) / median:>8.1f}{len(text or ''):>8}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Concurrent upload benchmark for /analyze/ against a stub model.
+
+Runs each concurrency level twice: once with extraction and the model call
+inline on the event loop (how /analyze/ used to work) and once through the
+execution layer. All requests of a level arrive at once and latency is
+measured from that moment. Inline, p99 grows linearly with the number of
+concurrent uploads; offloaded it stays close to a single request until the
+pools fill, after which extra requests are rejected with 429/503.
+
+    python benchmarks/load_analyze.py --latency 0.2 --levels 1 4 16 32
+"""
+import argparse
+import asyncio
+import time
+
+import httpx
+
+from common import SAMPLE_JD, SAMPLE_RESUME_LINES, load_app, make_pdf, percentile
+
+async def _inline(func, *args, reject=True, **kwargs):
+    return func(*args, **kwargs)
+
+async def run_level(client, resume_lines, concurrency):
+    # A distinct resume per request so the result cache never answers
+    pdfs = [make_pdf([[f"Candidate {time.time_ns()}-{i}"] + resume_lines]) for i in range(concurrency)]
+    start = time.perf_counter()
+
+    async def one(pdf):
+        response = await client.post(
+            "/analyze/",
+            files={"resume": ("resume.pdf", pdf, "application/pdf")},
+            data={"jd_text": SAMPLE_JD},
+        )
+        return response.status_code, time.perf_counter() - start
+
+    results = await asyncio.gather(*(one(pdf) for pdf in pdfs))
+    elapsed = time.perf_counter() - start
+    latencies = [latency for status, latency in results if status == 200]
+    rejected = sum(1 for status, _ in results if status in (429, 503))
+    failed = len(results) - len(latencies) - rejected
+    return latencies, rejected, failed, elapsed
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--latency", type=float, default=0.2, help="stub model latency in seconds")
+    parser.add_argument("--levels", type=int, nargs="+", default=[1, 4, 16, 32])
+    parser.add_argument("--repeat", type=int, default=8, help="copies of the sample resume per PDF")
+    args = parser.parse_args()
+
+    server = load_app(args.latency)
+    execution = server.execution
+    offloaded = (execution.run_extraction, execution.run_model)
+    resume_lines = SAMPLE_RESUME_LINES * args.repeat
+
+    rows = []
+    transport = httpx.ASGITransport(app=server.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        for mode in ("inline", "offloaded"):
+            if mode == "inline":
+                execution.run_extraction = execution.run_model = _inline
+            else:
+                execution.run_extraction, execution.run_model = offloaded
+            await run_level(client, resume_lines, 1)  # warm up (starts the pools)
+            for concurrency in args.levels:
+                rows.append((mode, concurrency, *await run_level(client, resume_lines, concurrency)))
+    execution.shutdown()
+
+    print(f"{'mode':<10}{'concurrency':>12}{'p50 (s)':>10}{'p99 (s)':>10}{'ok/s':>8}{'rejected':>10}{'failed':>8}")
+    for mode, concurrency, latencies, rejected, failed, elapsed in rows:
+        print(f"{mode:<10}{concurrency:>12}{percentile(latencies, 50):>10.3f}{percentile(latencies, 99):>10.3f}"
+              f"{len(latencies) / elapsed:>8.1f}{rejected:>10}{failed:>8}")
+
+if __name__ == "__main__":
+    asyncio.run(main())
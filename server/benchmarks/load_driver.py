@@ -0,0 +1,139 @@
+"""End-to-end concurrent load driver for /analyze/.
+
+Keeps --concurrency requests in flight until --requests have completed and
+reports throughput and latency percentiles, overall and per file type. By
+default it starts the server in-process under uvicorn on the fake model
+backend (MODEL_BACKEND=fake), configured by the --latency/--*-rate options;
+with --url it drives an already running server instead (start that one
+with MODEL_BACKEND=fake and FAKE_MODEL_* to stay offline).
+
+Resumes come from the generated corpus (corpus.py). Each request uses a
+distinct resume unless --distinct is smaller than --requests, in which case
+repeats are answered from the caches. After the run the server's /metrics
+are read back to show the mean time spent in each stage.
+
+    python benchmarks/load_driver.py --requests 500 --concurrency 32 --latency 0.8
+    python benchmarks/load_driver.py --url http://localhost:8000 --requests 200
+"""
+import argparse
+import asyncio
+import collections
+import contextlib
+import re
+import time
+
+import httpx
+
+from common import SAMPLE_JD, load_app, percentile, serve
+import corpus
+
+CONTENT_TYPES = {
+    "pdf": "application/pdf",
+    "docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+    "doc": "application/msword",
+}
+STAGE_SUM_RE = re.compile(r'^resume_stage_duration_seconds_(sum|count)\{stage="([^"]+)".*\} (\S+)$')
+
+def make_documents(args):
+    """(file_type, content) per distinct resume, cycling through --formats"""
+    return [
+        (file_type, corpus.make_document(file_type, seed, args.pages))
+        for seed, file_type in zip(range(args.distinct), args.formats * args.distinct)
+    ]
+
+async def drive(client, documents, args):
+    """Run the load; returns (results, elapsed) where each result is
+    (file_type, status, latency, raw_response)"""
+    results = []
+    next_request = iter(range(args.requests))
+
+    async def worker():
+        for index in next_request:
+            file_type, content = documents[index % len(documents)]
+            start = time.perf_counter()
+            try:
+                response = await client.post(
+                    "/analyze/",
+                    files={"resume": (f"resume-{index}.{file_type}", content, CONTENT_TYPES[file_type])},
+                    data={"jd_text": SAMPLE_JD},
+                )
+                status = response.status_code
+                raw = status == 200 and "raw_response" in response.json()["result"]
+            except httpx.HTTPError:
+                status, raw = "conn", False
+            results.append((file_type, status, time.perf_counter() - start, raw))
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+    return results, time.perf_counter() - start
+
+async def stage_means(client):
+    """Mean seconds per stage from the server's /metrics"""
+    response = await client.get("/metrics")
+    if response.status_code != 200:
+        return {}
+    totals = collections.defaultdict(lambda: [0.0, 0])
+    for line in response.text.splitlines():
+        match = STAGE_SUM_RE.match(line)
+        if match:
+            kind, stage, value = match.groups()
+            totals[stage][kind == "count"] += float(value)
+    return {stage: total / count for stage, (total, count) in totals.items() if count}
+
+def report(results, elapsed, stages):
+    ok = [latency for _, status, latency, _ in results if status == 200]
+    statuses = collections.Counter(str(status) for _, status, _, _ in results)
+    raw = sum(1 for *_, is_raw in results if is_raw)
+    print(f"{len(results)} requests in {elapsed:.2f}s: {len(ok) / elapsed:.1f} ok/s, "
+          f"statuses {dict(sorted(statuses.items()))}, raw_response fallbacks {raw}")
+
+    print(f"\n{'file type':<12}{'ok':>6}{'p50 (s)':>10}{'p95 (s)':>10}{'p99 (s)':>10}{'max (s)':>10}")
+    by_type = collections.defaultdict(list)
+    for file_type, status, latency, _ in results:
+        if status == 200:
+            by_type[file_type].append(latency)
+    for label, latencies in sorted(by_type.items()) + [("all", ok)]:
+        print(f"{label:<12}{len(latencies):>6}{percentile(latencies, 50):>10.3f}{percentile(latencies, 95):>10.3f}"
+              f"{percentile(latencies, 99):>10.3f}{max(latencies, default=0.0):>10.3f}")
+
+    if stages:
+        print(f"\n{'stage':<20}{'mean (ms)':>10}")
+        for stage, mean in sorted(stages.items(), key=lambda item: -item[1]):
+            print(f"{stage:<20}{mean * 1000:>10.2f}")
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="drive this server instead of starting one")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--distinct", type=int, help="distinct resumes to cycle through (default: --requests)")
+    parser.add_argument("--formats", nargs="+", choices=corpus.FORMATS, default=list(corpus.FORMATS))
+    parser.add_argument("--pages", type=int, default=2, help="pages per resume")
+    parser.add_argument("--latency", type=float, default=0.5, help="fake model latency in seconds")
+    parser.add_argument("--jitter", type=float, default=0.1, help="fake model latency jitter in seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of fake model calls that fail")
+    parser.add_argument("--truncated-rate", type=float, default=0.0, help="share of truncated JSON replies")
+    parser.add_argument("--malformed-rate", type=float, default=0.0, help="share of malformed JSON replies")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    args.distinct = min(args.distinct or args.requests, args.requests)
+
+    documents = make_documents(args)
+    async with contextlib.AsyncExitStack() as stack:
+        if args.url:
+            base_url, server = args.url, None
+        else:
+            server = load_app(
+                args.latency, jitter=args.jitter, error_rate=args.error_rate, truncated_rate=args.truncated_rate,
+                malformed_rate=args.malformed_rate, seed=args.seed,
+            )
+            base_url = await stack.enter_async_context(serve(server.app))
+        client = await stack.enter_async_context(httpx.AsyncClient(base_url=base_url, timeout=None))
+        results, elapsed = await drive(client, documents, args)
+        stages = await stage_means(client)
+    if server is not None:
+        server.execution.shutdown()
+    report(results, elapsed, stages)
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,74 @@
+"""Throughput and peak memory of the PDF extraction backends.
+
+Each backend runs in a fresh subprocess so peak RSS is measured per
+backend (ru_maxrss also counts pdfium's native allocations, which
+tracemalloc cannot see). The "auto" row is extract_pdf() with its pdfium
+first / pdfplumber fallback policy.
+
+    python benchmarks/pdf_backends.py --pages 100 --repeat 3
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+from common import SAMPLE_RESUME_LINES, make_pdf
+
+import extraction
+
+def worker(backend, path, repeat):
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    pages = chars = 0
+    start = time.perf_counter()
+    for _ in range(repeat):
+        if backend == "auto":
+            text, metadata = extraction.extract_pdf(path, backend="auto", max_pages=0, max_seconds=0)
+            pages += metadata["pages"]
+            chars += len(text)
+        else:
+            for text in extraction.iter_pdf_pages(path, backend):
+                pages += 1
+                chars += len(text)
+    elapsed = time.perf_counter() - start
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(json.dumps({
+        "pages_per_second": pages / elapsed,
+        "chars": chars // repeat,
+        "peak_rss_mb": peak / 1024,
+        "extraction_rss_mb": (peak - baseline) / 1024,
+    }))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--worker", nargs=2, metavar=("BACKEND", "PATH"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        worker(args.worker[0], args.worker[1], args.repeat)
+        return
+
+    with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as f:
+        f.write(make_pdf([SAMPLE_RESUME_LINES * 5] * args.pages))
+        path = f.name
+    try:
+        print(f"{args.pages}-page PDF, {os.path.getsize(path) // 1024} KB, {args.repeat} passes")
+        print(f"{'backend':<12}{'pages/s':>10}{'chars':>10}{'peak RSS (MB)':>15}{'extraction (MB)':>17}")
+        for backend in ("pdfium", "pdfplumber", "auto"):
+            output = subprocess.run(
+                [sys.executable, __file__, "--worker", backend, path, "--repeat", str(args.repeat)],
+                check=True, capture_output=True, text=True,
+            ).stdout
+            row = json.loads(output.strip().splitlines()[-1])
+            print(f"{backend:<12}{row['pages_per_second']:>10.1f}{row['chars']:>10}"
+                  f"{row['peak_rss_mb']:>15.1f}{row['extraction_rss_mb']:>17.1f}")
+    finally:
+        os.remove(path)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""Throughput benchmark for the local pre-scoring engine (scoring.py).
+
+Generates a seeded corpus of synthetic resumes with random skill mixes and
+scores them against a JD, one at a time (as /analyze/ does) and in one
+score_many() call (as a batch could).
+
+    python benchmarks/prescore_throughput.py --resumes 2000
+"""
+import argparse
+import random
+import time
+
+from common import SAMPLE_JD, percentile
+
+import scoring
+
+FILLER = [
+    "Collaborated with product and design to ship features on a two week cadence.",
+    "Owned the on-call rotation and wrote runbooks for the most common incidents.",
+    "Mentored two junior engineers and ran the team's code review guild.",
+    "Reduced cloud spend by 25% by right-sizing instances and adding autoscaling.",
+    "Presented quarterly roadmap updates to stakeholders across three departments.",
+]
+
+def synthetic_resume(rng, index):
+    skills = rng.sample(scoring.KNOWN_SKILLS, rng.randint(3, 20))
+    lines = [f"Candidate {index}", "EXPERIENCE"]
+    for _ in range(rng.randint(2, 5)):
+        lines.append(f"Engineer at Company {rng.randint(1, 500)} ({rng.randint(2010, 2020)} - {rng.randint(2021, 2025)})")
+        lines.extend(f"- {rng.choice(FILLER)} Used {rng.choice(skills)}." for _ in range(rng.randint(2, 6)))
+    lines += ["SKILLS", ", ".join(skills), "EDUCATION", "B.Sc. Computer Science"]
+    return "\n".join(lines)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--resumes", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    corpus = [synthetic_resume(rng, i) for i in range(args.resumes)]
+    scoring.score(corpus[0], SAMPLE_JD)  # warm up
+
+    timings = []
+    start = time.perf_counter()
+    for text in corpus:
+        t0 = time.perf_counter()
+        scoring.score(text, SAMPLE_JD)
+        timings.append((time.perf_counter() - t0) * 1000)
+    single_elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    results = scoring.score_many(corpus, SAMPLE_JD)
+    batch_elapsed = time.perf_counter() - start
+
+    scores = [result["ats_score"]["score"] for result in results]
+    print(f"corpus: {len(corpus)} resumes, mean score {sum(scores) / len(scores):.1f}")
+    print(f"score()      {len(corpus) / single_elapsed:>10.0f} resumes/s   "
+          f"p50 {percentile(timings, 50):.3f} ms   p99 {percentile(timings, 99):.3f} ms")
+    print(f"score_many() {len(corpus) / batch_elapsed:>10.0f} resumes/s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""Time-to-first-section benchmark for /analyze/stream against a stub model.
+
+The stub streams its reply in chunks spread over --latency seconds. For
+each request this records when the first section event and the ats_score
+section arrive versus when the stream finishes, next to the latency of the
+blocking /analyze/ endpoint for the same kind of input.
+
+    python benchmarks/stream_latency.py --requests 20 --latency 2
+"""
+import argparse
+import asyncio
+import json
+import time
+
+import httpx
+
+from common import SAMPLE_JD, SAMPLE_RESUME_LINES, load_app, percentile, serve
+
+def resume_file(tag):
+    text = "\n".join([f"Candidate {tag}"] + SAMPLE_RESUME_LINES)
+    return {"resume": ("resume.txt", text.encode("utf-8"), "text/plain")}
+
+async def time_stream(client, tag):
+    start = time.perf_counter()
+    first = score = None
+    event = None
+    async with client.stream("POST", "/analyze/stream", files=resume_file(tag), data={"jd_text": SAMPLE_JD}) as response:
+        response.raise_for_status()
+        async for line in response.aiter_lines():
+            if line.startswith("event: "):
+                event = line[len("event: "):]
+            elif line.startswith("data: ") and event == "section":
+                now = time.perf_counter() - start
+                first = first if first is not None else now
+                if json.loads(line[len("data: "):])["key"] == "ats_score":
+                    score = now
+    return first, score, time.perf_counter() - start
+
+async def time_blocking(client, tag):
+    start = time.perf_counter()
+    response = await client.post("/analyze/", files=resume_file(tag), data={"jd_text": SAMPLE_JD})
+    response.raise_for_status()
+    return time.perf_counter() - start
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=2.0, help="stub model generation time in seconds")
+    args = parser.parse_args()
+
+    server = load_app(args.latency)
+    firsts, scores, totals, blocking = [], [], [], []
+    async with serve(server.app) as base_url, httpx.AsyncClient(base_url=base_url, timeout=None) as client:
+        for i in range(args.requests):
+            first, score, total = await time_stream(client, f"stream-{i}")
+            firsts.append(first)
+            scores.append(score)
+            totals.append(total)
+            blocking.append(await time_blocking(client, f"blocking-{i}"))
+    server.execution.shutdown()
+
+    print(f"{'':<24}{'p50 (s)':>10}{'p99 (s)':>10}")
+    for label, samples in (
+        ("stream: first section", firsts),
+        ("stream: ats_score", scores),
+        ("stream: complete", totals),
+        ("/analyze/ (blocking)", blocking),
+    ):
+        print(f"{label:<24}{percentile(samples, 50):>10.3f}{percentile(samples, 99):>10.3f}")
+
+if __name__ == "__main__":
+    asyncio.run(main())
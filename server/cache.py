@@ -0,0 +1,244 @@
+import hashlib
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+def document_hasher(file_extension):
+    """Incremental hash for document_hash(): update() it with the content"""
+    return hashlib.sha256(file_extension.encode("utf-8") + b"\0")
+
+def document_hash(file_content, file_extension):
+    """Content address of an uploaded document.
+
+    The extension is part of the key because it decides which extractor
+    runs; the same bytes uploaded as .pdf and .doc give different text.
+    """
+    digest = document_hasher(file_extension)
+    digest.update(file_content)
+    return digest.hexdigest()
+
+def normalize_text(text):
+    """Collapse whitespace so cosmetic differences don't defeat the cache"""
+    return re.sub(r"\s+", " ", text or "").strip()
+
+def result_key(resume_text, jd_text, prompt_version, model_name, settings=None):
+    """Cache key for an analysis of `resume_text` against `jd_text`.
+
+    `settings` holds anything else that changes the prompt (e.g. how the
+    inputs are compacted) and must be JSON serialisable.
+    """
+    payload = json.dumps([
+        normalize_text(resume_text), normalize_text(jd_text), prompt_version, model_name, settings,
+    ], sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+class TTLCache:
+    """Bounded LRU cache whose entries expire after `ttl` seconds.
+
+    When `persist_dir` is set every entry is also written there as JSON, so
+    the cache survives restarts and is shared by workers on the same host.
+    The directory is swept every `sweep_interval` seconds: expired files are
+    deleted and, beyond `max_files` (default `max_entries`), the oldest.
+    Values must be JSON serialisable. Not thread safe: use it from the event
+    loop only.
+    """
+
+    def __init__(self, max_entries=256, ttl=3600, persist_dir=None, max_files=None, sweep_interval=60):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.persist_dir = persist_dir
+        self.max_files = max_files or max_entries
+        self.sweep_interval = sweep_interval
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()  # key -> (stored_at, value)
+        self._last_sweep = 0.0
+        if persist_dir:
+            os.makedirs(persist_dir, exist_ok=True)
+            self.sweep()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            entry = self._load(key)
+        if entry is not None and time.time() - entry[0] > self.ttl:
+            self.delete(key)
+            entry = None
+        if entry is None:
+            self.misses += 1
+            return None
+        self._remember(key, entry)
+        self.hits += 1
+        return entry[1]
+
+    def set(self, key, value):
+        entry = (time.time(), value)
+        self._remember(key, entry)
+        self._save(key, entry)
+        if self.persist_dir and entry[0] - self._last_sweep > self.sweep_interval:
+            self.sweep()
+
+    def delete(self, key):
+        self._entries.pop(key, None)
+        if self.persist_dir:
+            try:
+                os.remove(self._path(key))
+            except FileNotFoundError:
+                pass
+
+    def _remember(self, key, entry):
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            # Evicted entries stay on disk until sweep() removes them
+            self._entries.popitem(last=False)
+
+    def sweep(self):
+        """Delete expired files from `persist_dir`, then the oldest ones
+        beyond `max_files`"""
+        now = self._last_sweep = time.time()
+        files = []
+        try:
+            with os.scandir(self.persist_dir) as entries:
+                for entry in entries:
+                    # Leftover .tmp files from interrupted writes expire too
+                    if entry.is_file() and entry.name.endswith((".json", ".tmp")):
+                        files.append((entry.stat().st_mtime, entry.path))
+        except OSError as e:
+            logger.warning("Error sweeping cache directory %s: %s", self.persist_dir, e)
+            return
+        files.sort()
+        fresh = [item for item in files if now - item[0] <= self.ttl]
+        excess = max(0, len(fresh) - self.max_files)
+        for _, path in files[:len(files) - len(fresh) + excess]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def _path(self, key):
+        return os.path.join(self.persist_dir, f"{key}.json")
+
+    def _load(self, key):
+        if not self.persist_dir:
+            return None
+        try:
+            with open(self._path(key), encoding="utf-8") as f:
+                stored = json.load(f)
+            return stored["stored_at"], stored["value"]
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def _save(self, key, entry):
+        if not self.persist_dir:
+            return
+        # Write then rename so a concurrent reader never sees half a file
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"stored_at": entry[0], "value": entry[1]}, f)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning("Error persisting cache entry %s: %s", key, e)
+
+class SQLiteCache:
+    """Same interface as TTLCache, stored in a local SQLite database.
+
+    Survives restarts and can be shared by several workers on one host.
+    Callers use it from the event loop, so writes are kept cheap: commits
+    don't wait for an fsync (WAL with synchronous=NORMAL), a hit refreshes
+    the row's last use at most every `touch_interval` seconds, and expired
+    and least recently used rows beyond `max_entries` are deleted by a
+    sweep every `sweep_interval` seconds rather than on every set().
+    """
+
+    def __init__(self, path, max_entries=10000, ttl=7 * 24 * 3600, sweep_interval=60, touch_interval=60):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.sweep_interval = sweep_interval
+        self.touch_interval = touch_interval
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._last_sweep = 0.0
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        # In WAL mode NORMAL only risks the last commits on power loss,
+        # which for a cache is fine
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS cache ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+            "stored_at REAL NOT NULL, used_at REAL NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS cache_used_at ON cache (used_at)")
+
+    def __len__(self):
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+
+    def get(self, key):
+        now = time.time()
+        with self._lock:
+            row = self._db.execute(
+                "SELECT value, stored_at, used_at FROM cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None and now - row[1] > self.ttl:
+                self._db.execute("DELETE FROM cache WHERE key = ?", (key,))
+                row = None
+            if row is None:
+                self.misses += 1
+                return None
+            if now - row[2] > self.touch_interval:
+                self._db.execute("UPDATE cache SET used_at = ? WHERE key = ?", (now, key))
+            self.hits += 1
+        return json.loads(row[0])
+
+    def set(self, key, value):
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO cache (key, value, stored_at, used_at) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value), now, now),
+            )
+        if now - self._last_sweep > self.sweep_interval:
+            self.sweep()
+
+    def delete(self, key):
+        with self._lock:
+            self._db.execute("DELETE FROM cache WHERE key = ?", (key,))
+
+    def sweep(self):
+        """Delete expired rows, then the least recently used beyond
+        `max_entries`"""
+        now = self._last_sweep = time.time()
+        with self._lock:
+            self._db.execute("DELETE FROM cache WHERE stored_at < ?", (now - self.ttl,))
+            self._db.execute(
+                "DELETE FROM cache WHERE key IN ("
+                "SELECT key FROM cache ORDER BY used_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+
+def make_cache(backend, max_entries, ttl, path=None):
+    """Build a cache backend by name: "memory" or "sqlite" """
+    if backend == "memory":
+        return TTLCache(max_entries=max_entries, ttl=ttl)
+    if backend == "sqlite":
+        return SQLiteCache(path or "cache/results.sqlite3", max_entries=max_entries, ttl=ttl)
+    raise ValueError(f"Unknown cache backend: {backend}")
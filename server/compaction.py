@@ -0,0 +1,213 @@
+import math
+import os
+import re
+
+import scoring
+
+# Prompt compaction: strips the noise PDF extraction leaves in resume text
+# (repeated headers/footers, page numbers, whitespace) and JD boilerplate
+# before either goes into the prompt, within a token budget.
+
+# Combined budget for resume + JD, estimated at ~4 characters per token
+PROMPT_TOKEN_BUDGET = int(os.getenv("PROMPT_TOKEN_BUDGET", "3000"))
+# Share of the budget the JD may use at most
+JD_BUDGET_SHARE = 0.3
+
+SECTION_HEADINGS = {
+    "summary": ("summary", "profile", "professional summary", "objective", "about me", "career objective"),
+    "experience": ("experience", "work experience", "professional experience", "employment",
+                   "employment history", "work history", "internships", "internship"),
+    "projects": ("projects", "personal projects", "academic projects", "key projects", "project"),
+    "skills": ("skills", "technical skills", "core skills", "skills & tools", "skills and tools",
+               "technologies", "tech stack", "core competencies"),
+    "education": ("education", "academic background", "qualifications", "academics"),
+    "certifications": ("certifications", "certificates", "licenses & certifications", "courses"),
+    "achievements": ("achievements", "awards", "honors", "honours", "accomplishments"),
+}
+_HEADING_LOOKUP = {alias: section for section, aliases in SECTION_HEADINGS.items() for alias in aliases}
+
+# Order in which sections get the budget; "header" is the text before the
+# first heading (name, contact details)
+SECTION_PRIORITY = ("experience", "projects", "skills", "header", "education", "summary",
+                    "certifications", "achievements")
+
+# Every non-empty section is guaranteed its heading and opening lines, up to
+# this many tokens, before any section gets more
+MIN_SECTION_TOKENS = 40
+
+MIN_DEDUPE_CHARS = 15
+
+PAGE_NUMBER_RE = re.compile(r"^(page\s*)?-?\s*\d+\s*(of\s*\d+)?\s*-?$", re.IGNORECASE)
+
+JD_REQUIREMENT_MARKERS = (
+    "must", "required", "require", "requirement", "qualification", "experience", "proficien",
+    "knowledge", "familiar", "skill", "degree", "bachelor", "master", "years", "ability to",
+    "responsib", "you will", "you'll", "expert", "understanding", "plus", "preferred", "nice to have",
+)
+JD_BOILERPLATE_MARKERS = (
+    "equal opportunity", "equal employment", "without regard to", "benefits", "perks", "salary",
+    "compensation", "how to apply", "apply now", "about us", "our mission", "privacy", "accommodation",
+)
+
+def estimate_tokens(text):
+    """Rough token count (~4 characters per token)"""
+    return math.ceil(len(text or "") / 4)
+
+def clean_lines(text):
+    """Normalise whitespace and drop page numbers and repeated lines.
+
+    Lines that occur more than once (running headers and footers repeated
+    on every page, duplicated bullets) are kept only the first time, unless
+    they are shorter than MIN_DEDUPE_CHARS.
+    """
+    seen = set()
+    lines = []
+    for raw_line in (text or "").splitlines():
+        line = re.sub(r"\s+", " ", raw_line).strip()
+        if not line or PAGE_NUMBER_RE.match(line):
+            continue
+        key = line.lower()
+        if key in seen:
+            continue
+        # Short lines such as date ranges legitimately repeat
+        if len(line) >= MIN_DEDUPE_CHARS:
+            seen.add(key)
+        lines.append(line)
+    return lines
+
+def _heading(line):
+    candidate = line.lower().strip(" :-|•")
+    if len(candidate) > 40:
+        return None
+    return _HEADING_LOOKUP.get(candidate)
+
+def segment_resume(text):
+    """Split resume text into sections by heading.
+
+    Returns a list of (section, heading line or None, lines) in document
+    order; repeated headings append to the same section.
+    """
+    sections = {}
+    order = []
+    current = "header"
+    for line in clean_lines(text):
+        section = _heading(line)
+        if section:
+            current = section
+            if current not in sections:
+                sections[current] = (line, [])
+                order.append(current)
+            continue
+        if current not in sections:
+            sections[current] = (None, [])
+            order.append(current)
+        sections[current][1].append(line)
+    return [(section, sections[section][0], sections[section][1]) for section in order]
+
+def compact_resume(text, token_budget):
+    """Section-aware compaction of resume text into `token_budget` tokens.
+
+    First every section gets its heading and opening lines, up to
+    MIN_SECTION_TOKENS (a heading is never kept without at least one line
+    of its section); then the rest of the budget goes to sections in
+    SECTION_PRIORITY order, each keeping as many further lines as fit. The
+    output keeps the original section order.
+
+    Returns (text, truncated) where truncated lists the sections that lost
+    lines or were left out entirely, in document order.
+    """
+    segments = [segment for segment in segment_resume(text) if segment[2]]
+    remaining = token_budget * 4  # in characters
+    priority = {section: rank for rank, section in enumerate(SECTION_PRIORITY)}
+    ordered = sorted(segments, key=lambda s: priority.get(s[0], len(priority)))
+
+    # Reserve: heading + first line, then lines up to MIN_SECTION_TOKENS
+    taken = {}
+    for section, heading, lines in ordered:
+        opening = ([heading] if heading else []) + lines[:1]
+        cost = sum(len(line) + 1 for line in opening)
+        if cost > remaining:
+            continue
+        remaining -= cost
+        reserve = MIN_SECTION_TOKENS * 4 - cost
+        count = 1
+        for line in lines[1:]:
+            if len(line) + 1 > min(reserve, remaining):
+                break
+            reserve -= len(line) + 1
+            remaining -= len(line) + 1
+            count += 1
+        taken[section] = count
+
+    # Fill: the rest of the budget in priority order
+    for section, _, lines in ordered:
+        if section not in taken:
+            continue
+        for line in lines[taken[section]:]:
+            if len(line) + 1 > remaining:
+                break
+            remaining -= len(line) + 1
+            taken[section] += 1
+
+    output = []
+    truncated = []
+    for section, heading, lines in segments:
+        count = taken.get(section, 0)
+        if count:
+            output.extend(([heading] if heading else []) + lines[:count])
+        if count < len(lines):
+            truncated.append(section)
+    return "\n".join(output), truncated
+
+def compact_jd(jd_text, token_budget):
+    """Keep the requirement-bearing sentences of a JD within `token_budget`.
+
+    Sentences with requirement language or recognised skills are kept,
+    boilerplate (benefits, EEO statements, how to apply) is dropped. Falls
+    back to the cleaned full text if nothing looks like a requirement.
+    """
+    sentences = []
+    for line in clean_lines(jd_text):
+        sentences.extend(part for part in re.split(r"(?<=[.!?])\s+", line) if part)
+
+    def is_requirement(sentence):
+        lowered = sentence.lower()
+        if any(marker in lowered for marker in JD_BOILERPLATE_MARKERS):
+            return False
+        if any(marker in lowered for marker in JD_REQUIREMENT_MARKERS):
+            return True
+        return bool(scoring.extract_keywords(sentence))
+
+    kept = [sentence for sentence in sentences if is_requirement(sentence)] or sentences
+    remaining = token_budget * 4
+    chosen = []
+    for sentence in kept:
+        if len(sentence) + 1 > remaining:
+            break
+        chosen.append(sentence)
+        remaining -= len(sentence) + 1
+    return "\n".join(chosen)
+
+def compact_inputs(resume_text, jd_text, token_budget=None):
+    """Compact resume and JD text for the prompt.
+
+    Returns (resume_text, jd_text, stats) where stats reports characters
+    and estimated tokens before and after, and the resume sections that
+    were cut to fit (truncated_sections).
+    """
+    token_budget = token_budget or PROMPT_TOKEN_BUDGET
+    compact_jd_text = compact_jd(jd_text, int(token_budget * JD_BUDGET_SHARE))
+    compact_resume_text, truncated = compact_resume(
+        resume_text, token_budget - estimate_tokens(compact_jd_text)
+    )
+    stats = {
+        "resume_chars_before": len(resume_text),
+        "resume_chars_after": len(compact_resume_text),
+        "jd_chars_before": len(jd_text),
+        "jd_chars_after": len(compact_jd_text),
+        "input_tokens_before": estimate_tokens(resume_text) + estimate_tokens(jd_text),
+        "input_tokens_after": estimate_tokens(compact_resume_text) + estimate_tokens(compact_jd_text),
+        "token_budget": token_budget,
+        "truncated_sections": truncated,
+    }
+    return compact_resume_text, compact_jd_text, stats
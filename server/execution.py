@@ -0,0 +1,238 @@
+import asyncio
+import os
+import random
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+from fastapi import HTTPException
+
+# Execution layer: keeps CPU-heavy document parsing and blocking model calls
+# off the event loop, and bounds how much work may queue up behind them.
+
+def _env_int(name, default):
+    value = os.getenv(name)
+    return int(value) if value else default
+
+# Document parsing runs in a process pool (pdfplumber holds the GIL)
+EXTRACT_WORKERS = _env_int("EXTRACT_WORKERS", os.cpu_count() or 1)
+EXTRACT_MAX_PENDING = _env_int("EXTRACT_MAX_PENDING", EXTRACT_WORKERS * 8)
+
+# Hard limit on waiting for one extraction job (the extractors also stop at
+# EXTRACT_TIMEOUT_SECONDS between pages, but cannot interrupt a single page)
+EXTRACT_HARD_TIMEOUT = float(os.getenv("EXTRACT_HARD_TIMEOUT", "60"))
+
+# Model calls are network bound, so threads are enough
+MODEL_CONCURRENCY = _env_int("MODEL_CONCURRENCY", 16)
+MODEL_MAX_PENDING = _env_int("MODEL_MAX_PENDING", 64)
+MODEL_RETRY_BASE_DELAY = float(os.getenv("MODEL_RETRY_BASE_DELAY", "0.5"))
+
+class Backpressure:
+    """Limit concurrent jobs and the queue waiting in front of them.
+
+    At most `concurrency` jobs run at once and at most `max_pending` more may
+    wait for a slot. Anything beyond that is rejected immediately with
+    `status_code` rather than piling up behind the workers.
+    """
+
+    def __init__(self, name, concurrency, max_pending, status_code):
+        self.name = name
+        self.concurrency = concurrency
+        self.max_pending = max_pending
+        self.status_code = status_code
+        self.in_flight = 0  # running + waiting
+        self._semaphore = asyncio.Semaphore(concurrency)
+
+    def check(self):
+        """Raise the rejection error now if the queue is already full"""
+        if self.in_flight >= self.concurrency + self.max_pending:
+            raise HTTPException(
+                status_code=self.status_code,
+                detail=f"Server is busy ({self.name} queue is full). Please retry shortly.",
+                headers={"Retry-After": "1"},
+            )
+
+    async def acquire(self, reject=True):
+        """Wait for a slot (or raise the rejection error, see check)"""
+        if reject:
+            self.check()
+        self.in_flight += 1
+        try:
+            await self._semaphore.acquire()
+        except BaseException:
+            self.in_flight -= 1
+            raise
+
+    def release(self):
+        self._semaphore.release()
+        self.in_flight -= 1
+
+extraction_limiter = Backpressure("extraction", EXTRACT_WORKERS, EXTRACT_MAX_PENDING, 503)
+model_limiter = Backpressure("model", MODEL_CONCURRENCY, MODEL_MAX_PENDING, 429)
+
+_process_pool = None
+_thread_pool = None
+
+def _call_soon(loop, callback):
+    try:
+        loop.call_soon_threadsafe(callback)
+    except RuntimeError:
+        pass  # event loop already closed
+
+async def _submit(limiter, executor, func, reject=True):
+    """Run `func` in `executor` within a slot of `limiter`.
+
+    The slot is released when the job itself finishes, not when the caller
+    stops waiting for it (cancelled, timed out, client gone), so the
+    limiter never reports free capacity while workers are still busy.
+    """
+    await limiter.acquire(reject)
+    loop = asyncio.get_running_loop()
+    try:
+        job = executor.submit(func)
+    except BaseException:
+        limiter.release()
+        raise
+    job.add_done_callback(lambda _: _call_soon(loop, limiter.release))
+    return asyncio.wrap_future(job)
+
+def get_process_pool():
+    global _process_pool
+    if _process_pool is None:
+        _process_pool = ProcessPoolExecutor(max_workers=EXTRACT_WORKERS)
+    return _process_pool
+
+def get_thread_pool():
+    global _thread_pool
+    if _thread_pool is None:
+        _thread_pool = ThreadPoolExecutor(max_workers=MODEL_CONCURRENCY, thread_name_prefix="model")
+    return _thread_pool
+
+def _replace_process_pool(pool, kill=False):
+    """Stop using `pool`; the next job starts a fresh one.
+
+    With `kill` its workers are killed first, for a job stuck on a page
+    the extractors cannot interrupt. Other jobs running in it then fail
+    with BrokenProcessPool.
+    """
+    global _process_pool
+    if _process_pool is pool:
+        _process_pool = None
+    if kill:
+        # ProcessPoolExecutor has no public way to stop a running job
+        for process in list((pool._processes or {}).values()):
+            process.kill()
+    pool.shutdown(wait=False)
+
+async def run_extraction(func, *args, reject=True):
+    """Run a picklable extraction function in the process pool.
+
+    With `reject=False` the caller waits for a slot instead of getting a 503,
+    which is what batch jobs want. A job still running after
+    EXTRACT_HARD_TIMEOUT gets a 504 and its pool is killed and replaced, so
+    it cannot keep a worker (and its slot) busy. Jobs that lose their pool
+    this way or to a crashed worker are retried once on a fresh pool.
+    """
+    for attempt in range(2):
+        pool = get_process_pool()
+        job = await _submit(extraction_limiter, pool, partial(func, *args), reject)
+        try:
+            return await asyncio.wait_for(job, timeout=EXTRACT_HARD_TIMEOUT)
+        except asyncio.TimeoutError:
+            _replace_process_pool(pool, kill=True)
+            raise HTTPException(status_code=504, detail="Timed out extracting text from the resume.")
+        except BrokenProcessPool:
+            # A worker died (e.g. OOM on a hostile PDF, or killed above)
+            _replace_process_pool(pool)
+            if attempt:
+                raise
+            # Already admitted once: wait for a slot rather than be rejected
+            reject = False
+
+async def run_model(func, *args, reject=True, **kwargs):
+    """Run a blocking model call in the model thread pool.
+
+    If the caller is cancelled (e.g. a batch whose client went away) the
+    slot stays taken until the thread has finished the call.
+    """
+    return await (await _submit(model_limiter, get_thread_pool(), partial(func, *args, **kwargs), reject))
+
+async def stream_model(func, *args, reject=True, timing=None, **kwargs):
+    """Run a blocking model call that returns an iterator of chunks (e.g.
+    a model client's stream()) in the model thread pool, yielding
+    each chunk on the event loop as soon as it arrives.
+
+    The model slot stays taken until the producer thread has returned, which
+    after the consumer goes away is when the next chunk arrives. If `timing`
+    is a dict, the seconds spent waiting for the model (but not for the
+    consumer to take each chunk) are added to timing["seconds"].
+    """
+    loop = asyncio.get_running_loop()
+    queue = asyncio.Queue()
+    stopped = threading.Event()
+    finished = object()
+
+    def put(item):
+        _call_soon(loop, partial(queue.put_nowait, item))
+
+    def produce():
+        try:
+            for chunk in func(*args, **kwargs):
+                if stopped.is_set():
+                    # Consumer went away; stop reading the stream
+                    return
+                put((chunk, None))
+        except Exception as e:
+            put((finished, e))
+        else:
+            put((finished, None))
+
+    def account(since):
+        if timing is not None:
+            timing["seconds"] = timing.get("seconds", 0.0) + time.perf_counter() - since
+
+    since = time.perf_counter()
+    try:
+        await _submit(model_limiter, get_thread_pool(), produce, reject)
+        while True:
+            chunk, error = await queue.get()
+            if chunk is finished:
+                if error is not None:
+                    raise error
+                return
+            account(since)
+            since = None
+            yield chunk
+            since = time.perf_counter()
+    finally:
+        stopped.set()
+        if since is not None:
+            account(since)
+
+async def retry(make_call, retries, retry_on, base_delay=None, max_delay=8.0):
+    """Await make_call(), retrying `retry_on` errors with exponential backoff.
+
+    Uses full jitter so a batch of calls that failed together does not
+    retry in lockstep.
+    """
+    if base_delay is None:
+        base_delay = MODEL_RETRY_BASE_DELAY
+    attempt = 0
+    while True:
+        try:
+            return await make_call()
+        except retry_on:
+            if attempt >= retries:
+                raise
+            await asyncio.sleep(random.uniform(0, min(max_delay, base_delay * 2 ** attempt)))
+            attempt += 1
+
+def shutdown():
+    global _process_pool, _thread_pool
+    if _process_pool is not None:
+        _process_pool.shutdown(cancel_futures=True)
+        _process_pool = None
+    if _thread_pool is not None:
+        _thread_pool.shutdown(cancel_futures=True)
+        _thread_pool = None
@@ -0,0 +1,226 @@
+import logging
+import os
+import time
+import zipfile
+import zlib
+import pdfplumber
+import pypdfium2 as pdfium
+import docx2txt
+from io import BytesIO
+
+logger = logging.getLogger(__name__)
+
+SUPPORTED_EXTENSIONS = {'pdf', 'docx', 'doc', 'txt'}
+
+# PDF backend: "pdfium" (fast), "pdfplumber" (layout aware) or "auto" (pdfium,
+# falling back to pdfplumber when its output looks wrong)
+PDF_BACKEND = os.getenv("PDF_BACKEND", "auto")
+# Per-document limits (0 = unlimited); pages beyond these are dropped and
+# the document is marked truncated
+PDF_MAX_PAGES = int(os.getenv("PDF_MAX_PAGES", "50"))
+EXTRACT_TIMEOUT_SECONDS = float(os.getenv("EXTRACT_TIMEOUT_SECONDS", "20"))
+
+# Extractors accept either the file's bytes or the path of a spooled copy
+def _open_source(source):
+    return BytesIO(source) if isinstance(source, (bytes, bytearray)) else source
+
+def _read_source(source):
+    if isinstance(source, (bytes, bytearray)):
+        return bytes(source)
+    with open(source, 'rb') as f:
+        return f.read()
+
+class _PdfiumDocument:
+    def __init__(self, source):
+        self.pdf = pdfium.PdfDocument(source)
+
+    def __len__(self):
+        return len(self.pdf)
+
+    def page_text(self, index):
+        page = self.pdf[index]
+        textpage = page.get_textpage()
+        try:
+            return textpage.get_text_bounded().replace('\r\n', '\n').replace('\r', '\n')
+        finally:
+            textpage.close()
+            page.close()
+
+    def close(self):
+        self.pdf.close()
+
+class _PdfplumberDocument:
+    def __init__(self, source):
+        self.pdf = pdfplumber.open(_open_source(source))
+
+    def __len__(self):
+        return len(self.pdf.pages)
+
+    def page_text(self, index):
+        page = self.pdf.pages[index]
+        try:
+            return page.extract_text() or ""
+        finally:
+            # Drop the page's cached layout objects so memory stays flat
+            page.close()
+
+    def close(self):
+        self.pdf.close()
+
+PDF_BACKENDS = {'pdfium': _PdfiumDocument, 'pdfplumber': _PdfplumberDocument}
+
+def iter_pdf_pages(source, backend='pdfplumber', max_pages=None, deadline=None, status=None):
+    """Yield the text of each PDF page in turn.
+
+    Stops early after `max_pages` pages or once time.monotonic() passes
+    `deadline`; if a `status` dict is given, its "total_pages" and
+    "truncated" ("pages", "time" or None) keys are filled in.
+    """
+    document = PDF_BACKENDS[backend](source)
+    try:
+        page_count = len(document)
+        if status is not None:
+            status.update(total_pages=page_count, truncated=None)
+        for index in range(page_count):
+            if max_pages is not None and index >= max_pages:
+                reason = 'pages'
+            elif deadline is not None and time.monotonic() > deadline:
+                reason = 'time'
+            else:
+                yield document.page_text(index)
+                continue
+            if status is not None:
+                status['truncated'] = reason
+            return
+    finally:
+        document.close()
+
+def _needs_layout_fallback(text):
+    """Whether pdfium's plain-text output looks wrong enough to retry with
+    pdfplumber: next to no text, words run together, or mostly undecodable
+    glyphs (typical of unusual layouts and embedded fonts)."""
+    stripped = text.strip()
+    if len(stripped) < 50:
+        return True
+    words = stripped.split()
+    if len(stripped) / len(words) > 20:
+        return True
+    return stripped.count('\ufffd') > len(stripped) // 100
+
+def extract_pdf(source, backend=None, max_pages=None, max_seconds=None):
+    """Extract text from a PDF page by page within the configured limits.
+
+    Returns (text, metadata) where metadata records the backend used, the
+    number of pages read and whether the document was truncated.
+    """
+    backend = backend or PDF_BACKEND
+    # None means the configured default; 0 disables the limit
+    max_pages = (PDF_MAX_PAGES if max_pages is None else max_pages) or None
+    max_seconds = EXTRACT_TIMEOUT_SECONDS if max_seconds is None else max_seconds
+    deadline = time.monotonic() + max_seconds if max_seconds else None
+    candidates = ['pdfium', 'pdfplumber'] if backend == 'auto' else [backend]
+    for name in candidates:
+        status = {}
+        try:
+            pages = [page for page in iter_pdf_pages(source, name, max_pages, deadline, status) if page]
+        except Exception as e:
+            if name == candidates[-1]:
+                raise
+            logger.warning("Error extracting PDF with %s, falling back: %s", name, e)
+            continue
+        text = "\n".join(pages).strip()
+        if name != candidates[-1] and _needs_layout_fallback(text):
+            continue
+        metadata = {'backend': name, 'pages': len(pages), **status}
+        return text, metadata
+
+def extract_text_from_pdf(file_content):
+    """Extract text from PDF (see extract_pdf for backends and limits)"""
+    try:
+        text, _ = extract_pdf(file_content)
+        return text
+    except Exception as e:
+        logger.warning("Error extracting PDF: %s", e)
+        return None
+
+def extract_text_from_docx(file_content):
+    """Extract text from DOCX file"""
+    try:
+        return docx2txt.process(_open_source(file_content))
+    except Exception as e:
+        logger.warning("Error extracting DOCX: %s", e)
+        return None
+
+def extract_text_from_doc(file_content):
+    """Extract text from DOC file (basic fallback)"""
+    try:
+        # For .doc files, we'll use a basic text extraction
+        # In production, you might want to use python-docx2txt or similar
+        text = _read_source(file_content).decode('utf-8', errors='ignore')
+        return text
+    except Exception as e:
+        logger.warning("Error extracting DOC: %s", e)
+        return None
+
+def get_file_extension(filename):
+    """Lower-cased extension of an uploaded filename, or "" if there is none"""
+    return filename.lower().split('.')[-1] if filename else ""
+
+def extract_document(file_content, file_extension):
+    """Extract text based on file type.
+
+    Returns (text, metadata); metadata is only filled in for PDFs. Kept at
+    module level so it can be pickled and run inside the extraction process
+    pool.
+    """
+    if file_extension == 'pdf':
+        try:
+            return extract_pdf(file_content)
+        except Exception as e:
+            logger.warning("Error extracting PDF: %s", e)
+            return None, {}
+    elif file_extension == 'docx':
+        return extract_text_from_docx(file_content), {}
+    elif file_extension == 'doc':
+        return extract_text_from_doc(file_content), {}
+    else:
+        # Fallback to basic decoding
+        return _read_source(file_content).decode("utf-8", errors="ignore"), {}
+
+def iter_zip_documents(file_content, max_files, max_bytes, max_member_bytes=None):
+    """Yield (filename, content, error) for each resume inside a zip archive.
+
+    Members with unsupported extensions, directories and macOS metadata are
+    skipped. A member that cannot be read (corrupt, encrypted, unsupported
+    compression or larger than `max_member_bytes`) is yielded with content
+    None and the reason as `error`. Raises ValueError if the archive is
+    invalid or holds more than `max_files` resumes or `max_bytes` of
+    uncompressed data. Inflating is CPU bound: run it off the event loop.
+    """
+    try:
+        archive = zipfile.ZipFile(BytesIO(file_content))
+    except zipfile.BadZipFile as e:
+        raise ValueError(f"Invalid zip archive: {e}")
+    with archive:
+        members = [
+            info for info in archive.infolist()
+            if not info.is_dir()
+            and not info.filename.startswith('__MACOSX/')
+            and get_file_extension(info.filename) in SUPPORTED_EXTENSIONS
+        ]
+        # Check the declared sizes before inflating anything (zip bombs);
+        # reading stops at the declared size, so they can't be exceeded
+        if len(members) > max_files:
+            raise ValueError(f"Zip archive contains more than {max_files} resumes")
+        if sum(info.file_size for info in members) > max_bytes:
+            raise ValueError(f"Zip archive expands to more than {max_bytes} bytes")
+        for info in members:
+            filename = os.path.basename(info.filename)
+            if max_member_bytes is not None and info.file_size > max_member_bytes:
+                yield filename, None, f"File is larger than {max_member_bytes} bytes"
+                continue
+            try:
+                yield filename, archive.read(info), None
+            except (zipfile.BadZipFile, zlib.error, RuntimeError, NotImplementedError) as e:
+                # Bad CRC or data, encrypted member, unsupported compression
+                yield filename, None, f"Could not read file from the zip archive: {e}"
@@ -1,18 +1,44 @@
-from fastapi import FastAPI, UploadFile, Form, HTTPException
+from fastapi import FastAPI, UploadFile, File, Form, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-import google.generativeai as genai
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
 import os
 from dotenv import load_dotenv
+import asyncio
 import json
+import logging
+import random
 import re
-import pdfplumber
-import docx2txt
-from io import BytesIO
+import tempfile
+import time
+from typing import List, Optional
+from google.api_core import exceptions as google_exceptions
+import compaction
+import execution
+import metrics
+import scoring
+from cache import TTLCache, document_hash, document_hasher, make_cache, result_key
+from extraction import (
+    SUPPORTED_EXTENSIONS,
+    extract_document,
+    get_file_extension,
+    iter_zip_documents,
+)
+from model_client import make_model_client
+from prompts import PROMPT_VERSION, build_prompt, parse_model_response
+from streaming import SectionParser, sse_event
 
 # Load environment variables
 load_dotenv()
 
+# LOG_LEVEL sets the log level; per-request debug output (text previews) is
+# only logged for a LOG_SAMPLE_RATE fraction of requests
+logging.basicConfig(
+    level=os.getenv("LOG_LEVEL", "INFO").upper(),
+    format="%(asctime)s %(levelname)s %(name)s: %(message)s",
+)
+logger = logging.getLogger(__name__)
+LOG_SAMPLE_RATE = float(os.getenv("LOG_SAMPLE_RATE", "0.01"))
+
 app = FastAPI()
 
 # Allow CORS from your frontend
@@ -23,210 +49,603 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Setup Gemini API
-api_key = os.getenv("GEMINI_API_KEY")
-if not api_key:
-    raise ValueError("No GEMINI_API_KEY found in environment variables")
-genai.configure(api_key=api_key)
+# Extracted resume text keyed by content hash, shared by /extract-text/ and
+# /analyze/ so the same upload is only parsed once
+text_cache = TTLCache(
+    max_entries=int(os.getenv("TEXT_CACHE_SIZE", "256")),
+    ttl=int(os.getenv("TEXT_CACHE_TTL", "3600")),
+    persist_dir=os.getenv("TEXT_CACHE_DIR") or None,
+    # Files kept in TEXT_CACHE_DIR (shared by all workers); default TEXT_CACHE_SIZE
+    max_files=int(os.getenv("TEXT_CACHE_MAX_FILES", "0")) or None,
+)
+
+MODEL_NAME = os.getenv("GEMINI_MODEL", "gemini-2.0-flash")
+# "gemini", or "fake" to run without an API key or network (see model_client.py)
+MODEL_BACKEND = os.getenv("MODEL_BACKEND", "gemini")
+model_client = make_model_client(MODEL_BACKEND, MODEL_NAME)
+# Compact resume and JD text before it goes into the prompt (see compaction.py)
+PROMPT_COMPACTION = os.getenv("PROMPT_COMPACTION", "1") != "0"
+
+# Finished analyses keyed by (resume, JD, prompt version, model); a repeat
+# submission is answered without calling the model
+result_cache = make_cache(
+    os.getenv("RESULT_CACHE_BACKEND", "memory"),
+    max_entries=int(os.getenv("RESULT_CACHE_SIZE", "1024")),
+    ttl=int(os.getenv("RESULT_CACHE_TTL", str(24 * 3600))),
+    path=os.getenv("RESULT_CACHE_PATH") or None,
+)
+
+# Transient Gemini errors worth retrying with backoff
+MODEL_MAX_RETRIES = int(os.getenv("MODEL_MAX_RETRIES", "2"))
+RETRYABLE_MODEL_ERRORS = (
+    google_exceptions.ResourceExhausted,
+    google_exceptions.ServiceUnavailable,
+    google_exceptions.DeadlineExceeded,
+    google_exceptions.InternalServerError,
+)
+
+# /analyze/batch: resumes analysed at once per batch, and input limits
+BATCH_CONCURRENCY = int(os.getenv("BATCH_CONCURRENCY", "8"))
+BATCH_MAX_FILES = int(os.getenv("BATCH_MAX_FILES", "500"))
+BATCH_MAX_BYTES = int(os.getenv("BATCH_MAX_BYTES", str(200 * 1024 * 1024)))
+
+# Resumes whose local pre-score falls below this are answered from the
+# pre-score alone, without calling the model (unset = always call the model)
+PRESCORE_THRESHOLD = float(os.getenv("PRESCORE_THRESHOLD")) if os.getenv("PRESCORE_THRESHOLD") else None
 
-def extract_text_from_pdf(file_content):
-    """Extract text from PDF using pdfplumber"""
+# Uploads above MAX_UPLOAD_BYTES are refused; above SPOOL_THRESHOLD_BYTES they
+# are spooled to a temp file and the extractor reads them from disk
+MAX_UPLOAD_BYTES = int(os.getenv("MAX_UPLOAD_BYTES", str(20 * 1024 * 1024)))
+SPOOL_THRESHOLD_BYTES = int(os.getenv("SPOOL_THRESHOLD_BYTES", str(2 * 1024 * 1024)))
+UPLOAD_CHUNK_BYTES = 1024 * 1024
+
+def log_sampled():
+    """Whether this request's debug output should be logged"""
+    return logger.isEnabledFor(logging.DEBUG) and random.random() < LOG_SAMPLE_RATE
+
+def file_type_label(file_extension):
+    """Metric label for a file type. Extensions come from client filenames,
+    so anything unsupported is "other" to keep the label bounded"""
+    if not file_extension:
+        return "unknown"
+    return file_extension if file_extension in SUPPORTED_EXTENSIONS or file_extension == "zip" else "other"
+
+def detect_format(filename):
+    """File type of an upload; also labels the rest of the request's stage
+    metrics with it"""
+    with metrics.stage("format_detection"):
+        file_extension = get_file_extension(filename)
+        metrics.current_file_type.set(file_type_label(file_extension))
+    return file_extension
+
+def json_response(content):
+    """JSONResponse, timing the serialization of the body"""
+    with metrics.stage("serialization"):
+        return JSONResponse(content=content)
+
+async def read_upload(resume):
+    """Read an upload in chunks, hashing it on the way.
+
+    Returns (source, document_id). Source is the content as bytes or, past
+    SPOOL_THRESHOLD_BYTES, the path of a temp file the caller must remove.
+    """
+    digest = document_hasher(get_file_extension(resume.filename))
+    chunks = []
+    size = 0
+    spool = None
     try:
-        with pdfplumber.open(BytesIO(file_content)) as pdf:
-            text = ""
-            for page in pdf.pages:
-                page_text = page.extract_text()
-                if page_text:
-                    text += page_text + "\n"
-            return text.strip()
-    except Exception as e:
-        print(f"Error extracting PDF with pdfplumber: {e}")
-        return None
+        while True:
+            chunk = await resume.read(UPLOAD_CHUNK_BYTES)
+            if not chunk:
+                break
+            size += len(chunk)
+            if size > MAX_UPLOAD_BYTES:
+                raise HTTPException(
+                    status_code=413,
+                    detail=f"Resume is larger than the {MAX_UPLOAD_BYTES / (1024 * 1024):g} MB limit."
+                )
+            digest.update(chunk)
+            if spool is None and size > SPOOL_THRESHOLD_BYTES:
+                spool = tempfile.NamedTemporaryFile(prefix="resume-", delete=False)
+                spool.writelines(chunks)
+                chunks = []
+            if spool is not None:
+                spool.write(chunk)
+            else:
+                chunks.append(chunk)
+    except BaseException:
+        if spool is not None:
+            spool.close()
+            os.remove(spool.name)
+        raise
+    if spool is not None:
+        spool.close()
+        return spool.name, digest.hexdigest()
+    return b"".join(chunks), digest.hexdigest()
 
-def extract_text_from_docx(file_content):
-    """Extract text from DOCX file"""
+async def load_document(resume):
+    """Extract (or fetch from cache) the text of an uploaded resume.
+
+    Returns (document_id, document, cached) where document holds the text
+    and its metadata.
+    """
+    detect_format(resume.filename)
+    with metrics.stage("upload_read"):
+        source, document_id = await read_upload(resume)
     try:
-        return docx2txt.process(BytesIO(file_content))
-    except Exception as e:
-        print(f"Error extracting DOCX: {e}")
+        return await load_document_content(source, resume.filename, document_id=document_id)
+    finally:
+        if isinstance(source, str):
+            os.remove(source)
+
+async def load_document_content(content, filename, reject=True, document_id=None):
+    """Same as load_document, for content that has already been read"""
+    file_extension = get_file_extension(filename)
+    if document_id is None:
+        document_id = document_hash(content, file_extension)
+    with metrics.stage("extraction") as stage:
+        document = text_cache.get(document_id)
+        if document is not None:
+            stage["outcome"] = "cached"
+            return document_id, document, True
+
+        # Extract text based on file type (in the process pool)
+        resume_text, metadata = await execution.run_extraction(
+            extract_document, content, file_extension, reject=reject
+        )
+        if not resume_text:
+            stage["outcome"] = "empty"
+    document = {
+        "filename": filename,
+        "file_type": file_extension,
+        "text": resume_text,
+        **metadata,
+    }
+    if resume_text:
+        text_cache.set(document_id, document)
+    return document_id, document, False
+
+def get_cached_document(document_id):
+    """Look up a document previously returned by /extract-text/"""
+    if not re.fullmatch(r"[0-9a-f]{64}", document_id):
+        raise HTTPException(status_code=422, detail="Invalid document_id.")
+    return text_cache.get(document_id)
+
+async def resolve_resume_text(resume, document_id):
+    """Resume text for an analysis request, from the upload or a document_id"""
+    # A document_id from /extract-text/ saves uploading and parsing the
+    # resume again; the file is only needed if the entry has expired
+    document = get_cached_document(document_id) if document_id else None
+    if document is not None:
+        metrics.current_file_type.set(file_type_label(document.get("file_type")))
+    else:
+        if resume is None:
+            if document_id:
+                raise HTTPException(
+                    status_code=404,
+                    detail="Unknown or expired document_id. Please upload the resume again."
+                )
+            raise HTTPException(status_code=422, detail="Provide either a resume file or a document_id.")
+        document_id, document, _ = await load_document(resume)
+    resume_text = document["text"]
+
+    if not resume_text or len(resume_text.strip()) < 50:
+        raise HTTPException(
+            status_code=422, 
+            detail="Could not extract readable text from the resume. Please ensure the file is not corrupted and contains readable text."
+        )
+    return resume_text
+
+def prescreen(resume_text, jd_text, threshold):
+    """Local pre-score of the resume if it falls below `threshold`, else None"""
+    if threshold is None:
         return None
+    prescore = scoring.score(resume_text, jd_text)
+    if prescore["ats_score"]["score"] < threshold:
+        metrics.ANALYSIS_RESULTS.inc(outcome="prescreened")
+        return prescore
+    return None
+
+def analysis_key(resume_text, jd_text):
+    """Result cache key, covering everything that shapes the prompt"""
+    settings = {"compaction": PROMPT_COMPACTION}
+    if PROMPT_COMPACTION:
+        settings.update(token_budget=compaction.PROMPT_TOKEN_BUDGET, jd_share=compaction.JD_BUDGET_SHARE)
+    return result_key(resume_text, jd_text, PROMPT_VERSION, model_client.model_name, settings)
+
+def make_prompt(resume_text, jd_text, stats=None):
+    """Build the analysis prompt from compacted resume and JD text.
+
+    If a `stats` dict is given it is filled with the input size before and
+    after compaction.
+    """
+    truncated_sections = ()
+    if PROMPT_COMPACTION:
+        resume_text, jd_text, compaction_stats = compaction.compact_inputs(resume_text, jd_text)
+        if stats is not None:
+            stats.update(compaction_stats)
+        logger.debug("Prompt input compacted: %d -> %d estimated tokens",
+                     compaction_stats["input_tokens_before"], compaction_stats["input_tokens_after"])
+        truncated_sections = compaction_stats["truncated_sections"]
+    return build_prompt(resume_text, jd_text, truncated_sections)
+
+def recover_result(text):
+    """parse_model_response, recording how often it falls back to raw_response"""
+    with metrics.stage("json_recovery") as stage:
+        result, parsed = parse_model_response(text)
+        stage["outcome"] = "parsed" if parsed else "raw_response"
+    metrics.ANALYSIS_RESULTS.inc(outcome=stage["outcome"])
+    return result, parsed
 
-def extract_text_from_doc(file_content):
-    """Extract text from DOC file (basic fallback)"""
+async def run_analysis(resume_text, jd_text, reject=True):
+    """Analyse resume text against a JD, answering from the result cache
+    when possible.
+
+    Returns (result, cached, prompt_stats). prompt_stats are make_prompt's
+    stats, or None when no prompt was built (cached result, or compaction
+    off).
+    """
+    cache_key = analysis_key(resume_text, jd_text)
+    cached_result = result_cache.get(cache_key)
+    if cached_result is not None:
+        metrics.ANALYSIS_RESULTS.inc(outcome="cached")
+        return cached_result, True, None
+
+    stats = {}
+    with metrics.stage("prompt_build"):
+        prompt = make_prompt(resume_text, jd_text, stats)
+    with metrics.stage("model_call"):
+        response_text = await execution.retry(
+            lambda: execution.run_model(model_client.generate, prompt, reject=reject),
+            retries=MODEL_MAX_RETRIES,
+            retry_on=RETRYABLE_MODEL_ERRORS,
+        )
+
+    # Clean the response text to extract only the JSON
+    result, parsed = recover_result(response_text.strip())
+    if parsed:
+        result_cache.set(cache_key, result)
+    return result, False, stats or None
+
+@app.on_event("shutdown")
+def shutdown_pools():
+    execution.shutdown()
+
+@app.middleware("http")
+async def record_request_latency(request: Request, call_next):
+    """Request latency by route (for streaming responses: until the headers)"""
+    start = time.perf_counter()
+    status = 500
     try:
-        # For .doc files, we'll use a basic text extraction
-        # In production, you might want to use python-docx2txt or similar
-        text = file_content.decode('utf-8', errors='ignore')
-        return text
-    except Exception as e:
-        print(f"Error extracting DOC: {e}")
-        return None
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        # Label by route template, not the raw URL, to keep the series bounded
+        route = request.scope.get("route")
+        metrics.REQUEST_SECONDS.observe(
+            time.perf_counter() - start,
+            path=route.path if route else "unmatched",
+            method=request.method,
+            status=status,
+        )
 
 @app.post("/analyze/")
-async def analyze_resume(resume: UploadFile, jd_text: str = Form(...)):
+async def analyze_resume(
+    resume: Optional[UploadFile] = File(None),
+    jd_text: str = Form(...),
+    document_id: Optional[str] = Form(None),
+    mode: str = Form("full"),
+    prescore_threshold: Optional[float] = Form(None),
+):
+    """Analyse a resume against a JD.
+
+    mode="fast" returns only the local keyword pre-score (no model call).
+    In full mode, resumes pre-scoring below prescore_threshold (default
+    PRESCORE_THRESHOLD) are answered from the pre-score as well. Model
+    results come with prompt_stats (input size before and after
+    compaction), null when the result was cached and no prompt was built.
+    """
     try:
-        content = await resume.read()
-        
-        # Extract text based on file type
-        file_extension = resume.filename.lower().split('.')[-1] if resume.filename else ""
-        
-        if file_extension == 'pdf':
-            resume_text = extract_text_from_pdf(content)
-        elif file_extension == 'docx':
-            resume_text = extract_text_from_docx(content)
-        elif file_extension == 'doc':
-            resume_text = extract_text_from_doc(content)
-        else:
-            # Fallback to basic decoding
-            resume_text = content.decode("utf-8", errors="ignore")
-        
-        if not resume_text or len(resume_text.strip()) < 50:
-            raise HTTPException(
-                status_code=422, 
-                detail="Could not extract readable text from the resume. Please ensure the file is not corrupted and contains readable text."
-            )
-
-        # Debug: Print first 500 characters of extracted text
-        print(f"Extracted text preview: {resume_text[:500]}...")
-        print(f"Total text length: {len(resume_text)}")
-
-        prompt = f"""
-You are an expert ATS (Applicant Tracking System) and resume analysis AI. Analyze the following resume against the given job description and provide a comprehensive analysis in JSON format.
-
-Job Description:
-{jd_text}
-
-Resume:
-{resume_text}
-
-Please analyze and return a JSON response with the following structure:
-{{
-    "ats_score": {{
-        "score": <number out of 100>,
-        "explanation": "<detailed explanation of the score>"
-    }},
-    "missing_skills": [
-        {{
-            "skill": "<skill name>",
-            "importance": "<high/medium/low>",
-            "suggestion": "<how to acquire or demonstrate this skill>"
-        }}
-    ],
-    "missing_sections": [
-        {{
-            "section": "<section name>",
-            "importance": "<high/medium/low>",
-            "description": "<why this section is important>"
-        }}
-    ],
-    "grammar_and_spelling": {{
-        "errors_found": <number>,
-        "issues": [
-            {{
-                "type": "<grammar/spelling>",
-                "text": "<problematic text>",
-                "suggestion": "<corrected version>"
-            }}
-        ],
-        "overall_quality": "<excellent/good/fair/poor>"
-    }},
-    "projects_analysis": [
-        {{
-            "project_name": "<project name>",
-            "current_description": "<current description>",
-            "strengths": ["<strength 1>", "<strength 2>"],
-            "weaknesses": ["<weakness 1>", "<weakness 2>"],
-            "improvement_suggestions": ["<suggestion 1>", "<suggestion 2>"],
-            "quantifiable_achievements": {{
-                "current": ["<current metrics if any>"],
-                "suggested": ["<suggested metrics to add>"]
-            }}
-        }}
-    ],
-    "resume_format": {{
-        "overall_rating": "<excellent/good/fair/poor>",
-        "strengths": ["<format strength 1>", "<format strength 2>"],
-        "improvements": ["<improvement 1>", "<improvement 2>"],
-        "ats_compatibility": "<high/medium/low>"
-    }},
-    "proof_of_work_metrics": {{
-        "current_metrics": ["<existing quantified achievements>"],
-        "missing_opportunities": ["<areas where metrics could be added>"],
-        "suggested_metrics": [
-            {{
-                "area": "<area of work>",
-                "suggested_metric": "<specific metric to track>",
-                "example": "<example of how to present it>"
-            }}
-        ]
-    }},
-    "overall_recommendations": [
-        {{
-            "priority": "<high/medium/low>",
-            "recommendation": "<specific actionable advice>",
-            "impact": "<expected impact on ATS score/hiring chances>"
-        }}
-    ]
-}}
-
-Important guidelines:
-1. Be specific and actionable in all suggestions
-2. Focus on quantifiable improvements
-3. Consider ATS parsing capabilities
-4. Provide realistic timelines for improvements
-5. Prioritize changes that will have the biggest impact
-6. Check for grammar and spelling errors carefully
-7. Analyze each project for impact and measurable outcomes
-8. Ensure the JSON is properly formatted and valid
-"""
-
-        model = genai.GenerativeModel("gemini-2.0-flash")
-        response = model.generate_content(prompt)
-        
-        # Clean the response text to extract only the JSON
-        response_text = response.text.strip()
-        
-        # Try to extract JSON from the response
-        json_match = re.search(r'\{.*\}', response_text, re.DOTALL)
-        if json_match:
-            json_str = json_match.group()
-            try:
-                parsed_result = json.loads(json_str)
-                return JSONResponse(content={"result": parsed_result})
-            except json.JSONDecodeError:
-                # If JSON parsing fails, return the raw text
-                return JSONResponse(content={"result": {"raw_response": response_text}})
-        else:
-            return JSONResponse(content={"result": {"raw_response": response_text}})
+        if mode not in ("full", "fast"):
+            raise HTTPException(status_code=422, detail="mode must be 'full' or 'fast'.")
+
+        resume_text = await resolve_resume_text(resume, document_id)
+
+        if mode == "fast":
+            metrics.ANALYSIS_RESULTS.inc(outcome="fast")
+            return json_response({"result": scoring.score(resume_text, jd_text), "mode": "fast"})
+
+        if prescore_threshold is None:
+            prescore_threshold = PRESCORE_THRESHOLD
+        prescore = prescreen(resume_text, jd_text, prescore_threshold)
+        if prescore is not None:
+            return json_response({"result": prescore, "mode": "fast", "prescreened": True})
+
+        # Debug: log the first 500 characters of the extracted text
+        if log_sampled():
+            logger.debug("Extracted text preview: %s...", resume_text[:500])
+            logger.debug("Total text length: %d", len(resume_text))
+
+        result, cached, prompt_stats = await run_analysis(resume_text, jd_text)
+        return json_response({"result": result, "cached": cached, "prompt_stats": prompt_stats})
     
+    except HTTPException:
+        raise
     except Exception as e:
+        logger.exception("Analysis failed")
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/analyze/stream")
+async def analyze_resume_stream(
+    resume: Optional[UploadFile] = File(None),
+    jd_text: str = Form(...),
+    document_id: Optional[str] = Form(None),
+    mode: str = Form("full"),
+    prescore_threshold: Optional[float] = Form(None),
+):
+    """Streaming version of /analyze/ over server-sent events.
+
+    Emits a "section" event ({"key", "value"}) for each top-level part of
+    the analysis (ats_score, missing_skills, ...) as soon as the model has
+    finished generating it, then a "result" event with the full result as
+    /analyze/ would return it, or an "error" event. `mode` and
+    `prescore_threshold` work as for /analyze/; local pre-scores and cached
+    results are sent as the same events straight away.
+    """
+    # Errors found before streaming starts are still plain HTTP errors
+    if mode not in ("full", "fast"):
+        raise HTTPException(status_code=422, detail="mode must be 'full' or 'fast'.")
+    resume_text = await resolve_resume_text(resume, document_id)
+
+    # A result that needs no model call, and the rest of its "result" event
+    ready = None
+    if mode == "fast":
+        metrics.ANALYSIS_RESULTS.inc(outcome="fast")
+        ready = scoring.score(resume_text, jd_text), {"mode": "fast"}
+    else:
+        if prescore_threshold is None:
+            prescore_threshold = PRESCORE_THRESHOLD
+        prescore = prescreen(resume_text, jd_text, prescore_threshold)
+        if prescore is not None:
+            ready = prescore, {"mode": "fast", "prescreened": True}
+    cache_key = analysis_key(resume_text, jd_text)
+    if ready is None:
+        cached_result = result_cache.get(cache_key)
+        if cached_result is not None:
+            metrics.ANALYSIS_RESULTS.inc(outcome="cached")
+            ready = cached_result, {"cached": True, "prompt_stats": None}
+        else:
+            # Reject while we can still answer with a 429 rather than an event
+            execution.model_limiter.check()
+
+    async def events():
+        if ready is not None:
+            result, extra = ready
+            for key, value in result.items():
+                yield sse_event("section", {"key": key, "value": value})
+            yield sse_event("result", {"result": result, **extra})
+            return
+
+        parser = SectionParser()
+        prompt_stats = {}
+        try:
+            with metrics.stage("prompt_build"):
+                prompt = make_prompt(resume_text, jd_text, prompt_stats)
+            # Only the model's time: not the time spent waiting for the
+            # client to read each event
+            with metrics.stage("model_call") as model_call:
+                model_call["seconds"] = 0.0
+                async for chunk in execution.stream_model(model_client.stream, prompt, timing=model_call):
+                    for key, value in parser.feed(chunk):
+                        yield sse_event("section", {"key": key, "value": value})
+        except HTTPException as e:
+            yield sse_event("error", {"detail": e.detail})
+            return
+        except Exception as e:
+            yield sse_event("error", {"detail": str(e)})
+            return
+
+        result, parsed = recover_result(parser.buffer.strip())
+        if parsed:
+            result_cache.set(cache_key, result)
+        yield sse_event("result", {"result": result, "cached": False, "prompt_stats": prompt_stats or None})
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
 @app.post("/extract-text/")
 async def extract_text_only(resume: UploadFile):
     """Debug endpoint to see extracted text"""
     try:
-        content = await resume.read()
-        
-        # Extract text based on file type
-        file_extension = resume.filename.lower().split('.')[-1] if resume.filename else ""
+        document_id, document, cached = await load_document(resume)
+        resume_text = document["text"]
         
-        if file_extension == 'pdf':
-            resume_text = extract_text_from_pdf(content)
-        elif file_extension == 'docx':
-            resume_text = extract_text_from_docx(content)
-        elif file_extension == 'doc':
-            resume_text = extract_text_from_doc(content)
-        else:
-            resume_text = content.decode("utf-8", errors="ignore")
-        
-        return JSONResponse(content={
+        return json_response({
+            "document_id": document_id,
+            "cached": cached,
             "filename": resume.filename,
-            "file_type": file_extension,
+            "file_type": document["file_type"],
+            "pages": document.get("pages"),
+            "total_pages": document.get("total_pages"),
+            "truncated": document.get("truncated"),
             "text_length": len(resume_text) if resume_text else 0,
             "extracted_text": resume_text[:2000] + "..." if resume_text and len(resume_text) > 2000 else resume_text,
             "full_text": resume_text  # Be careful with this in production
         })
     
+    except HTTPException:
+        raise
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        logger.exception("Text extraction failed")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/cache-stats/")
+async def cache_stats():
+    """Hit/miss counters for the text and result caches"""
+    return {
+        name: {"hits": cache.hits, "misses": cache.misses, "entries": len(cache)}
+        for name, cache in (("text", text_cache), ("result", result_cache))
+    }
+
+def cache_metrics():
+    caches = (("text", text_cache), ("result", result_cache))
+    lines = []
+    for field in ("hits", "misses"):
+        lines += metrics.render_samples(
+            f"resume_cache_{field}_total", f"Cache {field}.", "counter",
+            [({"cache": name}, getattr(cache, field)) for name, cache in caches],
+        )
+    lines += metrics.render_samples(
+        "resume_cache_entries", "Entries currently cached.", "gauge",
+        [({"cache": name}, len(cache)) for name, cache in caches],
+    )
+    return lines
+
+def queue_metrics():
+    limiters = (execution.extraction_limiter, execution.model_limiter)
+    return metrics.render_samples(
+        "resume_queue_in_flight", "Jobs running or waiting for a slot.", "gauge",
+        [({"queue": limiter.name}, limiter.in_flight) for limiter in limiters],
+    ) + metrics.render_samples(
+        "resume_queue_capacity", "Jobs that may run or wait before new ones are rejected.", "gauge",
+        [({"queue": limiter.name}, limiter.concurrency + limiter.max_pending) for limiter in limiters],
+    )
+
+@app.get("/metrics")
+async def prometheus_metrics():
+    """Stage latencies, analysis outcomes and cache/queue state in the
+    Prometheus text format"""
+    return PlainTextResponse(
+        metrics.render((cache_metrics, queue_metrics)),
+        media_type="text/plain; version=0.0.4",
+    )
+
+async def read_limited(upload, limit, too_large):
+    """Read an upload in chunks, raising 413 with `too_large` past `limit` bytes"""
+    chunks = []
+    size = 0
+    while True:
+        chunk = await upload.read(UPLOAD_CHUNK_BYTES)
+        if not chunk:
+            return b"".join(chunks)
+        size += len(chunk)
+        if size > limit:
+            raise HTTPException(status_code=413, detail=too_large)
+        chunks.append(chunk)
+
+async def read_batch_uploads(resumes):
+    """Read batch uploads into (filename, content, error) triples, expanding zips.
+
+    Each resume may be at most MAX_UPLOAD_BYTES, and all uploads together,
+    zips counted both as uploaded and expanded, at most BATCH_MAX_BYTES.
+    Zip members that cannot be read are returned with content None and the
+    reason as `error`.
+    """
+    documents = []
+    remaining = BATCH_MAX_BYTES
+    batch_too_large = f"The batch is larger than the {BATCH_MAX_BYTES / (1024 * 1024):g} MB limit."
+    for upload in resumes:
+        file_extension = get_file_extension(upload.filename)
+        is_zip = file_extension == 'zip'
+        if is_zip or remaining <= MAX_UPLOAD_BYTES:
+            limit, too_large = remaining, batch_too_large
+        else:
+            limit = MAX_UPLOAD_BYTES
+            too_large = f"{upload.filename}: resume is larger than the {MAX_UPLOAD_BYTES / (1024 * 1024):g} MB limit."
+        with metrics.stage("upload_read", file_type=file_type_label(file_extension)):
+            content = await read_limited(upload, limit, too_large)
+        remaining -= len(content)
+        if is_zip:
+            try:
+                # Inflating up to BATCH_MAX_BYTES would block the event loop
+                members = await asyncio.to_thread(
+                    lambda: list(iter_zip_documents(content, BATCH_MAX_FILES, remaining, MAX_UPLOAD_BYTES))
+                )
+            except ValueError as e:
+                raise HTTPException(status_code=422, detail=f"{upload.filename}: {e}")
+            documents.extend(members)
+            remaining -= sum(len(member) for _, member, _ in members if member)
+        else:
+            documents.append((upload.filename, content, None))
+        if len(documents) > BATCH_MAX_FILES:
+            raise HTTPException(status_code=413, detail=f"A batch may contain at most {BATCH_MAX_FILES} resumes.")
+    if not documents:
+        raise HTTPException(status_code=422, detail="No resumes found in the upload.")
+    return documents
+
+@app.post("/analyze/batch")
+async def analyze_batch(
+    resumes: List[UploadFile] = File(...),
+    jd_text: str = Form(...),
+    prescore_threshold: Optional[float] = Form(None),
+):
+    """Analyse many resumes (files and/or zip archives) against one JD.
+
+    Streams one NDJSON line per resume as soon as it finishes, in completion
+    order, followed by a final summary line. Resumes pre-scoring below
+    prescore_threshold skip the model, as in /analyze/.
+    """
+    if prescore_threshold is None:
+        prescore_threshold = PRESCORE_THRESHOLD
+    # Read everything up front: the upload files are closed once the
+    # streaming response starts
+    documents = await read_batch_uploads(resumes)
+    semaphore = asyncio.Semaphore(BATCH_CONCURRENCY)
+
+    async def analyze_one(index, filename, content, error):
+        item = {"index": index, "filename": filename}
+        if error is not None:
+            item.update(status="error", error=error)
+            return item
+        async with semaphore:
+            try:
+                detect_format(filename)
+                # Batch work waits for a slot rather than being rejected
+                _, document, _ = await load_document_content(content, filename, reject=False)
+                resume_text = document["text"]
+                if not resume_text or len(resume_text.strip()) < 50:
+                    item.update(status="error", error="Could not extract readable text from the resume.")
+                    return item
+                prescore = prescreen(resume_text, jd_text, prescore_threshold)
+                if prescore is not None:
+                    item.update(status="ok", prescreened=True, result=prescore)
+                    return item
+                result, cached, prompt_stats = await run_analysis(resume_text, jd_text, reject=False)
+                item.update(status="ok", cached=cached, result=result, prompt_stats=prompt_stats)
+            except HTTPException as e:
+                item.update(status="error", error=e.detail)
+            except Exception as e:
+                item.update(status="error", error=str(e))
+        return item
+
+    async def stream_results():
+        started = time.perf_counter()
+        tasks = [
+            asyncio.create_task(analyze_one(index, *document))
+            for index, document in enumerate(documents)
+        ]
+        succeeded = 0
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                item = await next_done
+                succeeded += item["status"] == "ok"
+                file_type = file_type_label(get_file_extension(item["filename"]))
+                with metrics.stage("serialization", file_type=file_type):
+                    line = json.dumps(item) + "\n"
+                yield line
+        finally:
+            # Client went away: don't keep spending model quota
+            for task in tasks:
+                task.cancel()
+        yield json.dumps({"summary": {
+            "total": len(tasks),
+            "succeeded": succeeded,
+            "failed": len(tasks) - succeeded,
+            "elapsed_seconds": round(time.perf_counter() - started, 3),
+        }}) + "\n"
+
+    return StreamingResponse(stream_results(), media_type="application/x-ndjson")
@@ -0,0 +1,130 @@
+import asyncio
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+# Minimal Prometheus-style metrics: counters and histograms with labels,
+# rendered in the text exposition format for GET /metrics. Update them from
+# the event loop only (they are not locked).
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def _format_labels(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels) + "}"
+
+class Counter:
+    def __init__(self, name, help, labelnames=()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+
+    def inc(self, amount=1, **labels):
+        key = tuple(str(labels.get(name, "")) for name in self.labelnames)
+        self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        for key, value in sorted(self._values.items()):
+            lines.append(f"{self.name}{_format_labels(zip(self.labelnames, key))} {value}")
+        return lines
+
+class Histogram:
+    def __init__(self, name, help, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._series = {}  # labels -> [bucket counts..., sum, count]
+
+    def observe(self, value, **labels):
+        key = tuple(str(labels.get(name, "")) for name in self.labelnames)
+        series = self._series.get(key)
+        if series is None:
+            series = self._series[key] = [0] * (len(self.buckets) + 2)
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                series[i] += 1
+        series[-2] += value
+        series[-1] += 1
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for key, series in sorted(self._series.items()):
+            labels = list(zip(self.labelnames, key))
+            for bound, count in zip(self.buckets, series):
+                lines.append(f"{self.name}_bucket{_format_labels(labels + [('le', repr(float(bound)))])} {count}")
+            lines.append(f"{self.name}_bucket{_format_labels(labels + [('le', '+Inf')])} {series[-1]}")
+            lines.append(f"{self.name}_sum{_format_labels(labels)} {series[-2]}")
+            lines.append(f"{self.name}_count{_format_labels(labels)} {series[-1]}")
+        return lines
+
+def render_samples(name, help, type, samples):
+    """Render a metric from (labels dict, value) pairs collected at scrape time"""
+    lines = [f"# HELP {name} {help}", f"# TYPE {name} {type}"]
+    for labels, value in samples:
+        lines.append(f"{name}{_format_labels(sorted(labels.items()))} {value}")
+    return lines
+
+STAGE_SECONDS = Histogram(
+    "resume_stage_duration_seconds",
+    "Time spent in each request stage.",
+    ("stage", "file_type", "outcome"),
+)
+REQUEST_SECONDS = Histogram(
+    "resume_request_duration_seconds",
+    "End-to-end request latency by route and status code.",
+    ("path", "method", "status"),
+)
+ANALYSIS_RESULTS = Counter(
+    "resume_analysis_results_total",
+    "Analyses by how the result was obtained (parsed, raw_response, cached, prescreened, fast).",
+    ("outcome",),
+)
+
+# File type of the document the current request (or batch task) is
+# working on, so stages timed deeper in the call stack are labelled with it
+current_file_type = ContextVar("current_file_type", default="unknown")
+
+@contextmanager
+def stage(name, **labels):
+    """Time a block as one request stage.
+
+    Yields a dict whose "outcome" can be changed by the caller, e.g. to
+    "cached". It defaults to "ok", or to "rejected" (backpressure 429/503),
+    "cancelled" (the client went away) or "error" if the block raises. A
+    "seconds" entry set by the caller is recorded instead of the block's
+    wall time, for blocks that also wait on something else (e.g. the
+    client reading a stream).
+    """
+    result = {"outcome": "ok"}
+    start = time.perf_counter()
+    try:
+        yield result
+    except (GeneratorExit, asyncio.CancelledError):
+        result["outcome"] = "cancelled"
+        raise
+    except BaseException as e:
+        result["outcome"] = "rejected" if getattr(e, "status_code", None) in (429, 503) else "error"
+        raise
+    finally:
+        STAGE_SECONDS.observe(
+            result.get("seconds", time.perf_counter() - start),
+            stage=name,
+            file_type=labels.get("file_type", current_file_type.get()),
+            outcome=result["outcome"],
+        )
+
+def render(collectors=()):
+    """All metrics in Prometheus text format; `collectors` return extra lines"""
+    lines = []
+    for metric in (STAGE_SECONDS, REQUEST_SECONDS, ANALYSIS_RESULTS):
+        lines.extend(metric.render())
+    for collect in collectors:
+        lines.extend(collect())
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,113 @@
+import json
+import os
+import random
+import time
+from google.api_core import exceptions as google_exceptions
+
+# Model clients: the analysis only needs "prompt in, text out" (all at once
+# or in chunks). Both methods block, callers run them in the execution
+# layer's thread pool. MODEL_BACKEND picks the implementation:
+#   gemini - Google Gemini (needs GEMINI_API_KEY)
+#   fake   - local stand-in for offline benchmarks and development
+
+class GeminiClient:
+    """Google Gemini through google.generativeai"""
+
+    def __init__(self, model_name):
+        import google.generativeai as genai
+
+        api_key = os.getenv("GEMINI_API_KEY")
+        if not api_key:
+            raise ValueError("No GEMINI_API_KEY found in environment variables")
+        genai.configure(api_key=api_key)
+        self.model_name = model_name
+        self._model = genai.GenerativeModel(model_name)
+
+    def generate(self, prompt):
+        """The full reply text"""
+        return self._model.generate_content(prompt).text
+
+    def stream(self, prompt):
+        """Iterator of reply text chunks as they are generated"""
+        for chunk in self._model.generate_content(prompt, stream=True):
+            yield chunk.text
+
+FAKE_RESULT = {
+    "ats_score": {"score": 72, "explanation": "Canned analysis from the fake model backend"},
+    "missing_skills": [{"skill": "Kubernetes", "importance": "medium", "suggestion": "Deploy a side project"}],
+    "missing_sections": [],
+    "grammar_and_spelling": {"errors_found": 0, "issues": [], "overall_quality": "good"},
+    "projects_analysis": [],
+    "resume_format": {"overall_rating": "good", "strengths": [], "improvements": [], "ats_compatibility": "high"},
+    "proof_of_work_metrics": {"current_metrics": [], "missing_opportunities": [], "suggested_metrics": []},
+    "overall_recommendations": [],
+}
+
+def _env_float(name, default):
+    value = os.getenv(name)
+    return float(value) if value else default
+
+class FakeClient:
+    """Offline stand-in for Gemini with a configurable latency and failure mix.
+
+    Each call sleeps for `latency` seconds (+/- `jitter`) and then either
+    raises ServiceUnavailable (`error_rate`), replies with JSON cut off
+    halfway (`truncated_rate`), with JSON that does not parse
+    (`malformed_rate`), or with the canned FAKE_RESULT in a ```json fence
+    like Gemini does. Defaults come from the FAKE_MODEL_* settings.
+    """
+
+    model_name = "fake"
+
+    def __init__(self, latency=None, jitter=None, error_rate=None, truncated_rate=None,
+                 malformed_rate=None, stream_chunks=20, seed=None):
+        self.latency = _env_float("FAKE_MODEL_LATENCY", 0.5) if latency is None else latency
+        self.jitter = _env_float("FAKE_MODEL_JITTER", 0.0) if jitter is None else jitter
+        self.error_rate = _env_float("FAKE_MODEL_ERROR_RATE", 0.0) if error_rate is None else error_rate
+        self.truncated_rate = _env_float("FAKE_MODEL_TRUNCATED_RATE", 0.0) if truncated_rate is None else truncated_rate
+        self.malformed_rate = _env_float("FAKE_MODEL_MALFORMED_RATE", 0.0) if malformed_rate is None else malformed_rate
+        self.stream_chunks = stream_chunks
+        self._random = random.Random(seed)
+
+    def _delay(self):
+        return max(0.0, self.latency + self._random.uniform(-self.jitter, self.jitter))
+
+    def _reply(self):
+        """Pick this call's outcome: raise, or return the reply text"""
+        roll = self._random.random()
+        if roll < self.error_rate:
+            raise google_exceptions.ServiceUnavailable("Fake model backend: simulated outage")
+        roll -= self.error_rate
+        text = json.dumps(FAKE_RESULT, indent=2)
+        if roll < self.truncated_rate:
+            return "```json\n" + text[:len(text) // 2]
+        roll -= self.truncated_rate
+        if roll < self.malformed_rate:
+            # Single quotes and a trailing comma, as models sometimes produce
+            return "Here is the analysis:\n{'ats_score': {'score': 72, 'explanation': 'ok'},}"
+        return "```json\n" + text + "\n```"
+
+    def generate(self, prompt):
+        time.sleep(self._delay())
+        return self._reply()
+
+    def stream(self, prompt):
+        # The same total latency, spread over the chunks; errors surface
+        # before the first chunk
+        delay = self._delay()
+        text = self._reply()
+        size = -(-len(text) // self.stream_chunks)
+        for start in range(0, len(text), size):
+            time.sleep(delay / self.stream_chunks)
+            yield text[start:start + size]
+
+MODEL_BACKENDS = {
+    "gemini": GeminiClient,
+    "fake": lambda model_name: FakeClient(),
+}
+
+def make_model_client(backend, model_name):
+    """Model client for MODEL_BACKEND `backend`"""
+    if backend not in MODEL_BACKENDS:
+        raise ValueError(f"Unknown MODEL_BACKEND {backend!r}; expected one of {', '.join(MODEL_BACKENDS)}")
+    return MODEL_BACKENDS[backend](model_name)
@@ -0,0 +1,124 @@
+import json
+import re
+
+# Bump whenever the analysis prompt changes so cached results are not reused
+PROMPT_VERSION = "3"
+
+def build_prompt(resume_text, jd_text, truncated_sections=()):
+    """Build the Gemini prompt for analysing a resume against a JD.
+
+    `truncated_sections` names resume sections that were shortened to fit
+    the prompt; the model is told so, so it doesn't report them as missing.
+    """
+    truncation_note = ""
+    if truncated_sections:
+        truncation_note = (
+            "\nNote: the resume was shortened to fit the input limit. These sections were cut or "
+            f"left out: {', '.join(truncated_sections)}. Do not report them as missing sections and "
+            "do not penalise the resume for content that may have been cut.\n"
+        )
+    return f"""
+You are an expert ATS (Applicant Tracking System) and resume analysis AI. Analyze the following resume against the given job description and provide a comprehensive analysis in JSON format.
+{truncation_note}
+Job Description:
+{jd_text}
+
+Resume:
+{resume_text}
+
+Please analyze and return a JSON response with the following structure:
+{{
+    "ats_score": {{
+        "score": <number out of 100>,
+        "explanation": "<detailed explanation of the score>"
+    }},
+    "missing_skills": [
+        {{
+            "skill": "<skill name>",
+            "importance": "<high/medium/low>",
+            "suggestion": "<how to acquire or demonstrate this skill>"
+        }}
+    ],
+    "missing_sections": [
+        {{
+            "section": "<section name>",
+            "importance": "<high/medium/low>",
+            "description": "<why this section is important>"
+        }}
+    ],
+    "grammar_and_spelling": {{
+        "errors_found": <number>,
+        "issues": [
+            {{
+                "type": "<grammar/spelling>",
+                "text": "<problematic text>",
+                "suggestion": "<corrected version>"
+            }}
+        ],
+        "overall_quality": "<excellent/good/fair/poor>"
+    }},
+    "projects_analysis": [
+        {{
+            "project_name": "<project name>",
+            "current_description": "<current description>",
+            "strengths": ["<strength 1>", "<strength 2>"],
+            "weaknesses": ["<weakness 1>", "<weakness 2>"],
+            "improvement_suggestions": ["<suggestion 1>", "<suggestion 2>"],
+            "quantifiable_achievements": {{
+                "current": ["<current metrics if any>"],
+                "suggested": ["<suggested metrics to add>"]
+            }}
+        }}
+    ],
+    "resume_format": {{
+        "overall_rating": "<excellent/good/fair/poor>",
+        "strengths": ["<format strength 1>", "<format strength 2>"],
+        "improvements": ["<improvement 1>", "<improvement 2>"],
+        "ats_compatibility": "<high/medium/low>"
+    }},
+    "proof_of_work_metrics": {{
+        "current_metrics": ["<existing quantified achievements>"],
+        "missing_opportunities": ["<areas where metrics could be added>"],
+        "suggested_metrics": [
+            {{
+                "area": "<area of work>",
+                "suggested_metric": "<specific metric to track>",
+                "example": "<example of how to present it>"
+            }}
+        ]
+    }},
+    "overall_recommendations": [
+        {{
+            "priority": "<high/medium/low>",
+            "recommendation": "<specific actionable advice>",
+            "impact": "<expected impact on ATS score/hiring chances>"
+        }}
+    ]
+}}
+
+Important guidelines:
+1. Be specific and actionable in all suggestions
+2. Focus on quantifiable improvements
+3. Consider ATS parsing capabilities
+4. Provide realistic timelines for improvements
+5. Prioritize changes that will have the biggest impact
+6. Check for grammar and spelling errors carefully
+7. Analyze each project for impact and measurable outcomes
+8. Ensure the JSON is properly formatted and valid
+"""
+
+def parse_model_response(response_text):
+    """Extract the JSON analysis from the model's reply.
+
+    Returns (result, parsed). When no valid JSON object is found the result
+    is {"raw_response": response_text} and parsed is False.
+    """
+    # Try to extract JSON from the response
+    json_match = re.search(r'\{.*\}', response_text, re.DOTALL)
+    if json_match:
+        try:
+            return json.loads(json_match.group()), True
+        except json.JSONDecodeError:
+            # If JSON parsing fails, return the raw text
+            pass
+    return {"raw_response": response_text}, False
@@ -0,0 +1,259 @@
+import re
+from collections import Counter
+
+import numpy as np
+
+# Fast local pre-scoring: keyword extraction from the JD and BM25-style
+# matching against the resume text. Deterministic and a few milliseconds per
+# resume, so it can shortlist resumes before anything is sent to the model.
+#
+# Needs NumPy (pip install numpy), which main.py imports through this module:
+# install it into the server's virtualenv alongside fastapi and pdfplumber.
+
+# Multi-word and punctuated skills are matched as token sequences
+KNOWN_SKILLS = [
+    # Languages
+    # (single letters like C and R, and "go", are left out: too many false hits)
+    "python", "java", "javascript", "typescript", "golang", "rust", "c++", "c#", "ruby",
+    "php", "kotlin", "swift", "scala", "sql", "bash", "html", "css",
+    # Frameworks and libraries
+    "react", "next.js", "node.js", "express", "angular", "vue", "django", "flask", "fastapi",
+    "spring", "spring boot", ".net", "rails", "tailwind", "graphql", "rest", "grpc",
+    "pandas", "numpy", "pytorch", "tensorflow", "scikit-learn", "spark", "hadoop", "airflow",
+    # Data stores
+    "postgresql", "postgres", "mysql", "mongodb", "redis", "elasticsearch", "kafka", "rabbitmq",
+    "dynamodb", "cassandra", "sqlite", "snowflake", "bigquery",
+    # Infrastructure
+    "aws", "azure", "gcp", "docker", "kubernetes", "terraform", "ansible", "jenkins", "linux",
+    "ci/cd", "github actions", "microservices", "serverless", "nginx",
+    # Practices and fields
+    "machine learning", "deep learning", "nlp", "computer vision", "data analysis",
+    "data engineering", "system design", "distributed systems", "unit testing", "agile", "scrum",
+    "git", "llm", "etl", "devops", "figma", "application security", "network security",
+    "cloud security", "information security",
+    # Soft skills
+    "leadership", "communication", "mentoring", "stakeholder management", "project management",
+]
+
+# Skills that are also everyday English words. In a JD they only count when
+# written as a skill: matching the context pattern, or (if the flag is set)
+# capitalised mid-sentence. "REST" has to be upper case.
+AMBIGUOUS_SKILLS = {
+    "rest": (re.compile(r"\b(?-i:REST)\b|\brest(ful)?[\s-]+apis?\b", re.IGNORECASE), False),
+    "express": (re.compile(r"\bexpress\.?js\b", re.IGNORECASE), True),
+    "spring": (re.compile(r"\bspring\s+(framework|mvc|cloud|security)\b", re.IGNORECASE), True),
+    "swift": (re.compile(r"\bswiftui\b|\bswift\s+(programming|development)\b", re.IGNORECASE), True),
+    "rust": (re.compile(r"\brust\s+programming\b", re.IGNORECASE), True),
+    "spark": (re.compile(r"\bapache\s+spark\b|\bpyspark\b", re.IGNORECASE), True),
+    "rails": (re.compile(r"\bruby\s+on\s+rails\b", re.IGNORECASE), True),
+}
+
+STOPWORDS = set("""
+a about above after all also an and any are as at be been being both but by can could do does
+for from has have having he her his how i if in into is it its job like may more most must
+not of on or our out over own role should so some such than that the their them then there
+these they this those through to under up us using very was we well were what when where which
+while who will with within would you your
+ability able across candidate candidates company experience experienced work working team teams
+strong good great excellent knowledge understanding familiarity familiar proficiency proficient
+skills skill years year plus preferred required requirements requirement responsibilities
+including include includes etc new looking join help build building develop developing
+and/or e.g i.e b.sc m.sc b.tech m.tech ph.d b.s m.s b.a m.a
+""".split())
+
+# Abbreviations that are not skills (places, titles, HR terms, company
+# forms, business jargon)
+NON_SKILL_ACRONYMS = set("""
+usa uk eu us emea apac latam nyc sf la hq ceo cto cfo coo cio vp svp evp hr pto eeo eoe
+faq inc llc ltd gmbh ok tbd asap am pm est pst cet utc ft pt fte ote cv
+saas b2b b2c d2c q1 q2 q3 q4 h1 h2 kpi kpis okr okrs roi yoe w2 401k
+""".split())
+
+REQUIRED_MARKERS = ("must", "required", "requirement", "strong", "proficient", "expert", "essential")
+OPTIONAL_MARKERS = ("plus", "nice to have", "preferred", "bonus", "optional", "familiarity")
+
+IMPORTANCE_WEIGHTS = {"high": 3.0, "medium": 2.0, "low": 1.0}
+
+# BM25 term-frequency saturation and length normalisation
+BM25_K1 = 1.2
+BM25_B = 0.75
+# Reference resume length in tokens. Fixed rather than the batch average so
+# a resume scores the same whatever it is batched with
+AVG_RESUME_TOKENS = 500
+
+CONTACT_RE = re.compile(r"\S+@\S+|https?://\S+|www\.\S+", re.IGNORECASE)
+# Bare numbers and "3+" style year counts are not skills
+NUMBER_RE = re.compile(r"^[\d.,/+-]+$")
+# Initialisms such as "e.g." or "U.S."
+ABBREVIATION_RE = re.compile(r"^([a-z]\.)+[a-z]?$")
+# Contractions ("you'll", "don't"), dropped whole so their fragments
+# ("ll", "don") don't turn up as words
+CONTRACTION_RE = re.compile(r"[A-Za-z]+['\u2019][A-Za-z]+")
+
+TOKEN_RE = re.compile(r"[a-z0-9.+#/]*[a-z0-9+#]")
+
+def tokenize(text):
+    """Lower-case word tokens that keep skill punctuation (c++, node.js, ci/cd)"""
+    text = CONTRACTION_RE.sub(" ", (text or "").lower())
+    return [token.lstrip("./") or token for token in TOKEN_RE.findall(text)]
+
+_SKILL_TOKENS = {skill: tuple(tokenize(skill)) for skill in KNOWN_SKILLS}
+
+def _count_phrase(tokens, counts, phrase):
+    if len(phrase) == 1:
+        return counts.get(phrase[0], 0)
+    n = len(phrase)
+    return sum(1 for i in range(len(tokens) - n + 1) if tuple(tokens[i:i + n]) == phrase)
+
+def _sentence_importance(sentence):
+    lowered = sentence.lower()
+    if any(marker in lowered for marker in OPTIONAL_MARKERS):
+        return "low"
+    if any(marker in lowered for marker in REQUIRED_MARKERS):
+        return "high"
+    return "medium"
+
+def _written_as_skill(skill, sentence):
+    """Whether an AMBIGUOUS_SKILLS word is used as a skill in `sentence`"""
+    context, capitalised_counts = AMBIGUOUS_SKILLS[skill]
+    if context.search(sentence):
+        return True
+    if not capitalised_counts:
+        return False
+    for match in re.finditer(rf"\b{re.escape(skill)}\b", sentence, re.IGNORECASE):
+        word = match.group()
+        # Capitalised at the start of a sentence or bullet doesn't count
+        starts_sentence = not re.search(r"\w", sentence[:match.start()])
+        if word[0].isupper() and not starts_sentence:
+            return True
+    return False
+
+def _looks_technical(word, in_heading=False):
+    """Whether a word outside KNOWN_SKILLS looks like a technology name.
+
+    Only words with digits or symbols (S3, C++, OAuth2) or short acronyms
+    (AWS, SQL) count, and acronyms not in an all upper-case line
+    (`in_heading`), where every word looks like one. Capitalised and camel
+    case words are mostly roles, places, companies and products (LinkedIn,
+    SaaS), so they are ignored.
+    """
+    token = word.lower()
+    if ABBREVIATION_RE.match(token) or token in NON_SKILL_ACRONYMS:
+        return False
+    if any(ch.isdigit() or ch in "+#./" for ch in word):
+        return True
+    return not in_heading and word.isupper() and 2 <= len(word) <= 6
+
+def extract_keywords(jd_text):
+    """Skills and keywords the JD asks for, with an importance each.
+
+    Known skills are always picked up (AMBIGUOUS_SKILLS only when written
+    as a skill); other terms count when they look technical, see
+    _looks_technical. Returns a list of (keyword, token tuple, importance).
+    """
+    keywords = {}
+    ranks = {"low": 0, "medium": 1, "high": 2}
+
+    def add(keyword, tokens, importance):
+        current = keywords.get(keyword)
+        if current is None or ranks[importance] > ranks[current[1]]:
+            keywords[keyword] = (tokens, importance)
+
+    for sentence in re.split(r"(?<=[.!?;])\s+|\n+", jd_text or ""):
+        if not sentence.strip():
+            continue
+        importance = _sentence_importance(sentence)
+        tokens = tokenize(sentence)
+        counts = Counter(tokens)
+        for skill, skill_tokens in _SKILL_TOKENS.items():
+            if skill_tokens and _count_phrase(tokens, counts, skill_tokens):
+                if skill in AMBIGUOUS_SKILLS and not _written_as_skill(skill, sentence):
+                    continue
+                add(skill, skill_tokens, importance)
+        # Email addresses and URLs are contact details, not requirements
+        text = CONTRACTION_RE.sub(" ", CONTACT_RE.sub(" ", sentence))
+        in_heading = text.isupper()
+        words = re.findall(r"[A-Za-z0-9][A-Za-z0-9.+#/-]*[A-Za-z0-9+#]", text)
+        for word in words:
+            token = word.lower()
+            if token in STOPWORDS or token in keywords or len(token) < 2 or NUMBER_RE.match(token):
+                continue
+            # Ambiguous skills were handled above
+            if token in AMBIGUOUS_SKILLS:
+                continue
+            if _looks_technical(word, in_heading):
+                add(token, tuple(tokenize(token)), importance)
+
+    return [(keyword, tokens, importance) for keyword, (tokens, importance) in keywords.items() if tokens]
+
+def score_many(resume_texts, jd_text):
+    """Pre-score several resumes against one JD in a single pass.
+
+    Term frequencies for every (resume, keyword) pair go into one matrix,
+    so the BM25 saturation, coverage and cosine terms are computed with
+    NumPy for the whole batch at once.
+    """
+    keywords = extract_keywords(jd_text)
+    if not keywords:
+        return [_result(0, "No recognisable skills or keywords found in the job description.", [], [])
+                for _ in resume_texts]
+
+    tokenized = [tokenize(text) for text in resume_texts]
+    tf = np.zeros((len(resume_texts), len(keywords)))
+    for row, tokens in enumerate(tokenized):
+        counts = Counter(tokens)
+        for col, (_, phrase, _) in enumerate(keywords):
+            tf[row, col] = _count_phrase(tokens, counts, phrase)
+
+    weights = np.array([IMPORTANCE_WEIGHTS[importance] for _, _, importance in keywords])
+    lengths = np.array([max(len(tokens), 1) for tokens in tokenized], dtype=float)
+
+    # BM25 saturation: rewards mentioning a skill, with diminishing returns
+    # for repeating it, normalised into [0, 1)
+    norm = BM25_K1 * (1 - BM25_B + BM25_B * lengths[:, None] / AVG_RESUME_TOKENS)
+    saturation = tf * (BM25_K1 + 1) / (tf + norm) / (BM25_K1 + 1)
+    present = tf > 0
+    # Coverage gives full credit for any mention, saturation a little extra
+    # for skills that are actually backed up in the text
+    coverage = (present * weights).sum(axis=1) / weights.sum()
+    depth = (saturation * weights).sum(axis=1) / weights.sum()
+
+    # Cosine between the resume's keyword profile and the JD's importance
+    # weights rewards resumes whose emphasis matches the JD's. (No IDF across
+    # the batch, for the same reason as AVG_RESUME_TOKENS.)
+    cosine = saturation @ weights / (
+        np.linalg.norm(saturation, axis=1) * np.linalg.norm(weights) + 1e-9
+    )
+
+    scores = np.clip(np.rint(100 * (0.6 * coverage + 0.2 * depth + 0.2 * cosine)), 0, 100)
+
+    results = []
+    for row in range(len(resume_texts)):
+        matched = [keyword for col, (keyword, _, _) in enumerate(keywords) if present[row, col]]
+        missing = [(keyword, importance) for col, (keyword, _, importance) in enumerate(keywords)
+                   if not present[row, col]]
+        explanation = (
+            f"Local keyword match: {len(matched)} of {len(keywords)} job description "
+            f"keywords found in the resume ({coverage[row]:.0%} weighted coverage)."
+        )
+        results.append(_result(int(scores[row]), explanation, matched, missing))
+    return results
+
+def score(resume_text, jd_text):
+    """Pre-score one resume against a JD (see score_many)"""
+    return score_many([resume_text], jd_text)[0]
+
+def _result(score_value, explanation, matched, missing):
+    order = {"high": 0, "medium": 1, "low": 2}
+    return {
+        "ats_score": {"score": score_value, "explanation": explanation},
+        "missing_skills": [
+            {
+                "skill": keyword,
+                "importance": importance,
+                "suggestion": f"If you have experience with {keyword}, mention it explicitly with a concrete example.",
+            }
+            for keyword, importance in sorted(missing, key=lambda item: order[item[1]])
+        ],
+        "matched_skills": matched,
+    }
@@ -0,0 +1,74 @@
+import json
+
+class SectionParser:
+    """Incremental parser for the model's streamed JSON reply.
+
+    Feed it text chunks as they arrive; each call returns the top-level
+    members of the JSON object that completed in that chunk, as (key, value)
+    pairs. Anything before the opening brace (e.g. a ```json fence or a
+    preamble, brackets included) is skipped, as is a brace-delimited span
+    in which no member parses. Every character is scanned once, so feeding the whole reply
+    costs O(n) however it is chunked.
+    """
+
+    def __init__(self):
+        self.buffer = ""
+        self.done = False
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self._member_start = None
+        self._members = 0  # parsed in the current top-level object
+
+    def feed(self, chunk):
+        self.buffer += chunk
+        sections = []
+        buffer = self.buffer
+        i = self._pos
+        while i < len(buffer) and not self.done:
+            ch = buffer[i]
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif ch == "\\":
+                    self._escaped = True
+                elif ch == '"':
+                    self._in_string = False
+            elif self._depth == 0:
+                # Outside the object only an opening brace matters
+                if ch == "{":
+                    self._depth = 1
+                    self._member_start = i + 1
+                    self._members = 0
+            elif ch == '"':
+                self._in_string = True
+            elif ch in "{[":
+                self._depth += 1
+            elif ch in "}]":
+                self._depth -= 1
+                if self._depth == 0:
+                    self._emit(buffer[self._member_start:i], sections)
+                    # "{braces} in a preamble" are not the reply: keep looking
+                    self.done = self._members > 0
+            elif ch == "," and self._depth == 1:
+                self._emit(buffer[self._member_start:i], sections)
+                self._member_start = i + 1
+            i += 1
+        self._pos = i
+        return sections
+
+    def _emit(self, member, sections):
+        if not member.strip():
+            return
+        try:
+            parsed = json.loads("{" + member + "}")
+        except json.JSONDecodeError:
+            # Malformed member: leave it for the full-text fallback
+            return
+        self._members += len(parsed)
+        sections.extend(parsed.items())
+
+def sse_event(event, data):
+    """Format one server-sent event with a JSON payload"""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
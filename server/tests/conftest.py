@@ -0,0 +1,7 @@
+import os
+import sys
+
+# The server modules are top-level modules (uvicorn main:app runs from server/)
+SERVER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if SERVER_DIR not in sys.path:
+    sys.path.insert(0, SERVER_DIR)
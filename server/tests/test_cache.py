@@ -0,0 +1,94 @@
+import os
+import time
+
+import pytest
+
+import cache
+from cache import SQLiteCache, TTLCache
+
+class Clock:
+    """Stands in for the time module in cache.py"""
+
+    def __init__(self):
+        self.now = time.time()
+
+    def time(self):
+        return self.now
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(cache, "time", clock)
+    return clock
+
+@pytest.fixture(params=["memory", "persisted", "sqlite"])
+def make(request, tmp_path, clock):
+    def make(max_entries=2, ttl=10):
+        if request.param == "memory":
+            return TTLCache(max_entries=max_entries, ttl=ttl)
+        if request.param == "persisted":
+            return TTLCache(max_entries=max_entries, ttl=ttl, persist_dir=str(tmp_path / "texts"))
+        # Sweep on every set() and record every use, so eviction is exact
+        return SQLiteCache(str(tmp_path / "results.sqlite3"), max_entries=max_entries, ttl=ttl,
+                           sweep_interval=0, touch_interval=0)
+    return make
+
+def test_entries_expire_after_ttl(make, clock):
+    store = make()
+    store.set("a", {"text": "resume"})
+    clock.now += 9
+    assert store.get("a") == {"text": "resume"}
+    clock.now += 2
+    assert store.get("a") is None
+    assert (store.hits, store.misses) == (1, 1)
+
+def test_least_recently_used_entry_is_evicted(make, clock):
+    store = make(max_entries=2)
+    store.set("a", 1)
+    clock.now += 1
+    store.set("b", 2)
+    clock.now += 1
+    assert store.get("a") == 1
+    clock.now += 1
+    store.set("c", 3)
+    if isinstance(store, TTLCache) and store.persist_dir:
+        # Still on disk until swept; only memory is bounded by max_entries
+        assert list(store._entries) == ["a", "c"]
+    else:
+        assert store.get("b") is None
+        assert store.get("a") == 1 and store.get("c") == 3
+
+def test_sqlite_cache_survives_restart(tmp_path, clock):
+    path = str(tmp_path / "results.sqlite3")
+    SQLiteCache(path).set("a", {"score": 72})
+    assert SQLiteCache(path).get("a") == {"score": 72}
+
+def test_sqlite_sweep_deletes_expired_rows(tmp_path, clock):
+    store = SQLiteCache(str(tmp_path / "results.sqlite3"), ttl=10, sweep_interval=60)
+    store.set("a", 1)
+    clock.now += 11
+    store.sweep()
+    assert len(store) == 0
+
+def test_persisted_entries_are_shared_and_swept(tmp_path, clock):
+    directory = str(tmp_path / "texts")
+    writer = TTLCache(max_entries=10, ttl=10, persist_dir=directory, max_files=2, sweep_interval=60)
+    for key in ("a", "b", "c"):
+        writer.set(key, key)
+        os.utime(writer._path(key), (clock.now, clock.now))
+        clock.now += 1
+    # A second worker reads the first one's entries from disk
+    assert TTLCache(ttl=10, persist_dir=directory, max_files=10).get("c") == "c"
+
+    writer.sweep()
+    assert sorted(os.listdir(directory)) == ["b.json", "c.json"]
+
+    clock.now += 9
+    writer.sweep()
+    assert os.listdir(directory) == ["c.json"]
+    with open(os.path.join(directory, "x.json.123.tmp"), "w") as f:
+        f.write("{")
+    os.utime(os.path.join(directory, "x.json.123.tmp"), (clock.now - 20, clock.now - 20))
+    writer.sweep()
+    # Leftovers of interrupted writes expire like entries
+    assert os.listdir(directory) == ["c.json"]
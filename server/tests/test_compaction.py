@@ -0,0 +1,79 @@
+import glob
+import os
+
+import pytest
+
+import compaction
+import scoring
+from prompts import build_prompt
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "compaction")
+RESUMES = sorted(glob.glob(os.path.join(FIXTURES_DIR, "resume_*.txt")))
+JDS = sorted(glob.glob(os.path.join(FIXTURES_DIR, "jd_*.txt")))
+PAIRS = [(resume, jd) for resume in RESUMES for jd in JDS]
+# The default PROMPT_TOKEN_BUDGET; resume_long and jd_long exceed it
+BUDGET = 3000
+# Largest pre-score change compaction may cause, in points
+TOLERANCE = 5
+
+RESUME = "\n".join(
+    ["Jane Doe", "jane@example.com", "SUMMARY"]
+    + [f"Backend engineer, summary line {i} about python services." for i in range(3)]
+    + ["EXPERIENCE"]
+    + [f"- Shipped feature {i} of the billing platform in python and go" for i in range(60)]
+    + ["SKILLS", "python, go, postgresql", "EDUCATION", "B.Sc. Computer Science", "PROJECTS"]
+    + [f"- Side project {i}: a small CLI written in rust" for i in range(5)]
+)
+
+def test_every_section_keeps_content_when_budget_binds():
+    text, truncated = compaction.compact_resume(RESUME, 250)
+    lines = text.splitlines()
+    for heading in ("SUMMARY", "EXPERIENCE", "SKILLS", "EDUCATION", "PROJECTS"):
+        assert heading in lines
+    assert "- Shipped feature 0 of the billing platform in python and go" in lines
+    assert compaction.estimate_tokens(text) <= 250
+    assert "experience" in truncated and "skills" not in truncated
+
+def test_no_heading_without_content():
+    text, truncated = compaction.compact_resume(RESUME, 30)
+    lines = text.splitlines()
+    headings = {"SUMMARY", "EXPERIENCE", "SKILLS", "EDUCATION", "PROJECTS"}
+    for i, line in enumerate(lines):
+        if line in headings:
+            assert i + 1 < len(lines) and lines[i + 1] not in headings
+    assert "summary" in truncated and "projects" in truncated
+
+def test_nothing_truncated_within_budget():
+    text, truncated = compaction.compact_resume(RESUME, 10000)
+    assert truncated == []
+    assert text.count("\n") == RESUME.count("\n")
+
+def test_prompt_mentions_truncated_sections():
+    assert "were cut" not in build_prompt("resume", "jd")
+    assert "left out: experience, projects." in build_prompt("resume", "jd", ["experience", "projects"])
+
+def read(path):
+    with open(path, encoding="utf-8") as f:
+        return f.read()
+
+def pair_id(pair):
+    return "-".join(os.path.basename(path)[:-4] for path in pair)
+
+@pytest.mark.parametrize("resume_path, jd_path", PAIRS, ids=[pair_id(pair) for pair in PAIRS])
+def test_compaction_keeps_the_prescore(resume_path, jd_path):
+    resume_text, jd_text = read(resume_path), read(jd_path)
+    compact_resume, compact_jd, _ = compaction.compact_inputs(resume_text, jd_text, BUDGET)
+    before = scoring.score(resume_text, jd_text)
+    after = scoring.score(compact_resume, compact_jd)
+    assert abs(after["ats_score"]["score"] - before["ats_score"]["score"]) <= TOLERANCE
+    assert {skill["skill"] for skill in after["missing_skills"]} == {
+        skill["skill"] for skill in before["missing_skills"]
+    }
+
+def test_fixtures_exercise_the_budget():
+    # Otherwise the checks above prove nothing about cutting
+    cut = [
+        pair_id((resume_path, jd_path)) for resume_path, jd_path in PAIRS
+        if compaction.compact_inputs(read(resume_path), read(jd_path), BUDGET)[2]["truncated_sections"]
+    ]
+    assert cut
@@ -0,0 +1,87 @@
+import asyncio
+import time
+
+import pytest
+from fastapi import HTTPException
+
+import execution
+from execution import Backpressure
+
+@pytest.fixture(autouse=True)
+def pools(monkeypatch):
+    """Small fresh pools and limiters for each test"""
+    monkeypatch.setattr(execution, "EXTRACT_WORKERS", 2)
+    monkeypatch.setattr(execution, "MODEL_CONCURRENCY", 2)
+    monkeypatch.setattr(execution, "_process_pool", None)
+    monkeypatch.setattr(execution, "_thread_pool", None)
+    monkeypatch.setattr(execution, "extraction_limiter", Backpressure("extraction", 2, 0, 503))
+    monkeypatch.setattr(execution, "model_limiter", Backpressure("model", 1, 1, 429))
+    yield
+    execution.shutdown()
+
+async def wait_until(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out waiting"
+        await asyncio.sleep(0.01)
+
+def test_cancelled_model_call_keeps_its_slot_until_the_thread_is_done():
+    async def scenario():
+        limiter = execution.model_limiter
+        call = asyncio.create_task(execution.run_model(time.sleep, 0.3))
+        await wait_until(lambda: limiter.in_flight == 1)
+        call.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await call
+        # The thread is still sleeping, so the slot is still taken
+        assert limiter.in_flight == 1
+        await wait_until(lambda: limiter.in_flight == 0)
+
+    asyncio.run(scenario())
+
+def test_hard_timeout_returns_504_and_replaces_the_pool(monkeypatch):
+    monkeypatch.setattr(execution, "EXTRACT_HARD_TIMEOUT", 0.3)
+
+    async def scenario():
+        limiter = execution.extraction_limiter
+        started = time.monotonic()
+        with pytest.raises(HTTPException) as error:
+            await execution.run_extraction(time.sleep, 30)
+        assert error.value.status_code == 504
+        assert time.monotonic() - started < 5
+        # The stuck worker was killed, which frees its slot
+        await wait_until(lambda: limiter.in_flight == 0)
+        assert execution._process_pool is None
+        # The next job gets a fresh pool
+        assert await execution.run_extraction(abs, -3) == 3
+
+    asyncio.run(scenario())
+
+def test_model_calls_beyond_concurrency_plus_pending_get_429():
+    async def scenario():
+        limiter = execution.model_limiter  # 1 running + 1 waiting
+        calls = [asyncio.create_task(execution.run_model(time.sleep, 0.2)) for _ in range(2)]
+        await wait_until(lambda: limiter.in_flight == 2)
+        with pytest.raises(HTTPException) as error:
+            await execution.run_model(time.sleep, 0)
+        assert error.value.status_code == 429
+        assert error.value.headers == {"Retry-After": "1"}
+        await asyncio.gather(*calls)
+        # Waiting instead of rejecting still works when full
+        await execution.run_model(time.sleep, 0, reject=False)
+        assert limiter.in_flight == 0
+
+    asyncio.run(scenario())
+
+def test_extractions_beyond_concurrency_plus_pending_get_503():
+    async def scenario():
+        limiter = execution.extraction_limiter  # 2 running, no queue
+        jobs = [asyncio.create_task(execution.run_extraction(time.sleep, 0.5)) for _ in range(2)]
+        await wait_until(lambda: limiter.in_flight == 2)
+        with pytest.raises(HTTPException) as error:
+            await execution.run_extraction(abs, -1)
+        assert error.value.status_code == 503
+        await asyncio.gather(*jobs)
+        await wait_until(lambda: limiter.in_flight == 0)
+
+    asyncio.run(scenario())
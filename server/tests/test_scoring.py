@@ -0,0 +1,42 @@
+import scoring
+
+JD = """Acme Corp is hiring a Senior Software Engineer to join our Platform team in Berlin.
+You will work with Product Managers and Designers to build REST APIs in Python.
+Requirements: 4+ years of experience with Python, AWS and Docker. Familiarity with Kubernetes is a plus.
+The rest of the team uses Go, and we express our ideas openly. Spring is our busiest season.
+Apply at jobs@acme.com or https://acme.com/careers. Acme Corp GmbH is an EEO employer, e.g. we value diversity.
+Nice to have: GraphQL, S3, CI/CD and TypeScript. Security clearance is not required."""
+
+def keywords(jd_text):
+    return {keyword for keyword, _, _ in scoring.extract_keywords(jd_text)}
+
+def test_realistic_jd_has_no_noise_keywords():
+    assert keywords(JD) == {
+        "python", "rest", "aws", "docker", "kubernetes", "graphql", "s3", "ci/cd", "typescript",
+    }
+
+def test_ambiguous_skills_need_skill_context():
+    assert "rest" not in keywords("Take a rest. The rest of the team is remote.")
+    assert "express" not in keywords("Express your ideas. We express opinions freely.")
+    assert "spring" not in keywords("Spring is busy. Join us this spring.")
+    assert "security" not in keywords("Security clearance is not required.")
+    assert {"rest", "express", "spring"} <= keywords(
+        "We build REST services with Node.js, Express and Spring."
+    )
+    assert "rest" in keywords("Experience designing rest APIs.")
+
+def test_matching_resume_is_not_screened_out():
+    resume = "Python engineer. Built REST APIs on AWS with Docker and Kubernetes, CI/CD with GitHub Actions."
+    result = scoring.score(resume, JD)
+    assert result["ats_score"]["score"] >= 70
+    assert not any(skill["importance"] == "high" for skill in result["missing_skills"])
+
+def test_contact_details_and_numbers_are_not_keywords():
+    found = keywords("Send your CV to jobs@example.com (www.example.com). Required: 3+ years of Python.")
+    assert found == {"python"}
+
+def test_headings_contractions_and_business_jargon_are_not_keywords():
+    jd = ("ABOUT THE ROLE\nWHAT YOU'LL DO\nBuild backend services in Python.\nPERKS & BENEFITS\n"
+          "Remote-first, Q4 bonus, 401(k), B2B SaaS.\nApply via LinkedIn.")
+    assert keywords(jd) == {"python"}
+    assert scoring.score("Python engineer who builds backend services", jd)["ats_score"]["score"] >= 70
@@ -0,0 +1,50 @@
+import json
+
+from streaming import SectionParser
+
+REPLY = {
+    "ats_score": {"score": 72, "explanation": "Uses {braces}, [brackets] and \"quotes\" \\ escapes"},
+    "missing_skills": [{"skill": "Kubernetes", "importance": "high"}],
+    "overall_recommendations": ["Add metrics, e.g. \"cut p99 by 40%\""],
+}
+
+def feed_all(text, chunk_size):
+    parser = SectionParser()
+    sections = []
+    for start in range(0, len(text), chunk_size):
+        sections.extend(parser.feed(text[start:start + chunk_size]))
+    return parser, sections
+
+def test_fenced_reply_in_any_chunking():
+    text = "```json\n" + json.dumps(REPLY, indent=2) + "\n```"
+    for chunk_size in (1, 2, 3, 7, 64, len(text)):
+        parser, sections = feed_all(text, chunk_size)
+        assert sections == list(REPLY.items())
+        assert parser.done
+
+def test_preamble_with_brackets_and_braces():
+    text = "Here is the analysis [JSON] for {candidate}:\n" + json.dumps(REPLY)
+    for chunk_size in (1, 5, len(text)):
+        parser, sections = feed_all(text, chunk_size)
+        assert sections == list(REPLY.items())
+        assert parser.done
+
+def test_escapes_split_across_chunks():
+    text = json.dumps({"a": 'ends with a backslash \\', "b": 'quote " and } brace'})
+    backslash = text.index("\\\\")
+    chunks = [text[:backslash + 1], text[backslash + 1:]]  # split between \ and the escaped char
+    parser = SectionParser()
+    sections = [pair for chunk in chunks for pair in parser.feed(chunk)]
+    assert sections == [("a", "ends with a backslash \\"), ("b", 'quote " and } brace')]
+
+def test_sections_arrive_as_soon_as_complete():
+    parser = SectionParser()
+    assert parser.feed('{"ats_score": {"score": 1}') == []
+    assert parser.feed(', "missing') == [("ats_score", {"score": 1})]
+    assert parser.feed('_skills": []}') == [("missing_skills", [])]
+    assert parser.done
+
+def test_truncated_reply_is_not_done():
+    parser, sections = feed_all('{"ats_score": {"score": 1}, "missing_skills": [{"sk', 4)
+    assert sections == [("ats_score", {"score": 1})]
+    assert not parser.done
@@ -21,6 +21,9 @@ const ResumeAnalyzer = () => {
   const onDrop = useCallback((acceptedFiles: File[]) => {
     if (acceptedFiles && acceptedFiles.length > 0) {
       setResumeFile(acceptedFiles[0])
+      // A new file invalidates the previous extraction (and its document_id)
+      setExtractedText(null)
+      setShowExtractedText(false)
     }
   }, [])
 
@@ -96,16 +99,35 @@ const ResumeAnalyzer = () => {
 
     setIsLoading(true)
     setShowForm(false)
-    const formData = new FormData()
-    formData.append("resume", resumeFile)
-    formData.append("jd_text", jdText)
+    const documentId: string | undefined = extractedText?.document_id
+
+    // Reuse the server-side extraction from "Extract Text" when we have one,
+    // so the resume is not uploaded and parsed a second time
+    const buildFormData = (useDocumentId: boolean) => {
+      const formData = new FormData()
+      if (useDocumentId && documentId) {
+        formData.append("document_id", documentId)
+      } else {
+        formData.append("resume", resumeFile)
+      }
+      formData.append("jd_text", jdText)
+      return formData
+    }
 
     try {
-      const res = await fetch("http://localhost:8000/analyze/", {
+      let res = await fetch("http://localhost:8000/analyze/", {
         method: "POST",
-        body: formData,
+        body: buildFormData(true),
       })
 
+      if (res.status === 404 && documentId) {
+        // Cached text expired on the server; fall back to uploading the file
+        res = await fetch("http://localhost:8000/analyze/", {
+          method: "POST",
+          body: buildFormData(false),
+        })
+      }
+
       if (!res.ok) {
         const errorData = await res.json()
         throw new Error(errorData.detail || "Server error")